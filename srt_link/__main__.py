@@ -1,2 +1,5 @@
-from srt_link import main
-main()
+import sys
+
+from srt_link.cli import main
+
+sys.exit(main())
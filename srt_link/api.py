@@ -0,0 +1,96 @@
+from __future__ import annotations
+from io import StringIO
+from typing import Iterable, Iterator, List, Union
+
+from srt_link.models.base import SRTSections
+from srt_link.models.input_filter import SectionFilter
+from srt_link.models.reader import iter_raw_chunks
+from srt_link.models.section import Section
+from srt_link.models.writer import write_sections
+from srt_link.pipeline import ENGINES, LINKED_ENGINE, NUMPY_ENGINE, merge_sections
+
+# srt text, utf-8 bytes, or an iterable of chunks of either
+Document = Union[str, bytes, bytearray, memoryview, Iterable[Union[str, bytes]]]
+
+
+def _chunks(document: Document) -> Iterable[str | bytes]:
+    if isinstance(document, (str, bytes, bytearray, memoryview)):
+        return (document,)
+    return document
+
+
+def iter_clean(
+        document: Document,
+        input_filter: SectionFilter | None = None,
+        lookback: float | None = None,
+        engine: str = LINKED_ENGINE
+) -> Iterator[Section]:
+    """Filter, merge, and order the sections of an in-memory srt document, see `srt_link.run`
+
+    Every call works on its own sections, calls may run concurrently from many threads and share a filter.
+
+    Param:
+        document:                       srt text, utf-8 bytes, or an iterable of chunks of either
+        input_filter (SectionFilter):   filter applied to every section before it is merged
+        lookback (float):               yield the sections as soon as they are final, see `SRTSections`
+        engine (str):                   merge engine, one of `ENGINES`
+    Returns:
+        An iterator over the cleaned sections in order
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine: {engine}")
+    if engine != LINKED_ENGINE and lookback is not None:
+        raise ValueError("Lookback streaming requires the linked engine")
+    if engine == NUMPY_ENGINE:
+        from srt_link.models import vectorized
+        if not vectorized.available():
+            raise ValueError("The numpy engine requires NumPy")
+    # arguments are checked on the call, the sections are read on iteration
+    return _iter_clean(document, input_filter, lookback, engine)
+
+
+def _iter_clean(
+        document: Document,
+        input_filter: SectionFilter | None,
+        lookback: float | None,
+        engine: str
+) -> Iterator[Section]:
+    sections = SRTSections(lookback=lookback)
+    if engine == NUMPY_ENGINE:
+        from srt_link.models import vectorized
+        buffer = b"".join(
+            chunk.encode("utf-8") if isinstance(chunk, str) else bytes(chunk) for chunk in _chunks(document)
+        )
+        vectorized.read_sections(buffer, sections, input_filter)
+    elif lookback is None:
+        items = ((Section.from_str(raw_section), input_filter) for raw_section in iter_raw_chunks(_chunks(document)))
+        merge_sections(items, sections, engine)
+    else:
+        for raw_section in iter_raw_chunks(_chunks(document)):
+            sections.insert(Section.from_str(raw_section), section_filter=input_filter)
+            yield from sections.pop_final()
+    yield from sections.iter_sections()
+
+
+def clean(
+        document: Document,
+        input_filter: SectionFilter | None = None,
+        engine: str = LINKED_ENGINE
+) -> str:
+    """Clean an in-memory srt document, see `iter_clean`
+
+    Returns:
+        The cleaned srt text
+    """
+    output = StringIO()
+    write_sections(output, iter_clean(document, input_filter, engine=engine))
+    return output.getvalue()
+
+
+def clean_batch(
+        documents: Iterable[Document],
+        input_filter: SectionFilter | None = None,
+        engine: str = LINKED_ENGINE
+) -> List[str]:
+    """Clean many in-memory srt documents with the same filter, compiled once, see `clean`"""
+    return [clean(document, input_filter, engine=engine) for document in documents]
@@ -0,0 +1,130 @@
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable, List, NamedTuple, Tuple
+import logging
+
+from srt_link.models.input_filter import SectionFilter
+from srt_link.pipeline import run
+
+LOG = logging.getLogger(__name__)
+
+GLOB_CHARS = "*?["
+
+
+class BatchResult(NamedTuple):
+    input_file: str
+    output_file: str
+    error: str | None = None    # None on success
+
+
+def _expand(source: str, base: Path | None = None) -> List[Tuple[Path, Path]]:
+    """Expand a file, directory or glob to (input file, output path relative to the output directory)"""
+    path = Path(source)
+    if base and not path.is_absolute():
+        path = base / path
+    if not any(char in source for char in GLOB_CHARS):
+        if path.is_dir():
+            return [(file, file.relative_to(path)) for file in sorted(path.rglob("*.srt")) if file.is_file()]
+        return [(path, Path(path.name))]
+    # mirror the paths below the first component with a glob pattern
+    root = Path(path.anchor)
+    parts = path.parts[len(root.parts):] if path.anchor else path.parts
+    for index, part in enumerate(parts):
+        if any(char in part for char in GLOB_CHARS):
+            root = root.joinpath(*parts[:index])
+            pattern = str(Path(*parts[index:]))
+            break
+    return [(file, file.relative_to(root)) for file in sorted(root.glob(pattern)) if file.is_file()]
+
+
+def collect_inputs(sources: Iterable[str], manifest: str | None = None) -> List[Tuple[Path, Path]]:
+    """Expand the batch sources and the entries of a manifest file, one source per line, `#` for comments
+
+    Relative manifest entries are resolved from the manifest directory.
+    """
+    jobs = []
+    for source in sources:
+        jobs.extend(_expand(source))
+    if manifest:
+        with open(manifest, 'r', encoding='utf-8') as fd:
+            for line in fd:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    jobs.extend(_expand(line, base=Path(manifest).parent))
+    return jobs
+
+
+def _run_job(input_file: str, output_file: str, input_filter: SectionFilter | None, run_kwargs: dict) -> BatchResult:
+    try:
+        Path(output_file).parent.mkdir(parents=True, exist_ok=True)
+        run(input_file=input_file, output_file=output_file, input_filter=input_filter, **run_kwargs)
+    except Exception as e:
+        return BatchResult(input_file, output_file, f"{type(e).__name__}: {e}")
+    return BatchResult(input_file, output_file)
+
+
+def run_batch(
+        sources: Iterable[str],
+        output_dir: str,
+        input_filter: SectionFilter | None = None,
+        manifest: str | None = None,
+        workers: int | None = None,
+        **run_kwargs
+) -> List[BatchResult]:
+    """Run every input of the batch, mirroring the input paths under the output directory
+
+    Param:
+        sources (Iterable[str]):        srt files, directories (searched for *.srt recursively) and globs
+        output_dir (str):               output root directory
+        input_filter (SectionFilter):   filter applied to every input
+        manifest (str):                 file listing more sources, one per line
+        workers (int):                  worker processes [default=cpu count], 1 runs in this process
+        run_kwargs:                     passed to `srt_link.run`
+    Returns:
+        A result per input in input order, a failed input does not stop the batch
+    """
+    jobs = []
+    inputs_of = {}     # output path -> input files written to it
+    for input_file, relative_path in collect_inputs(sources, manifest):
+        output_file = str(Path(output_dir) / relative_path)
+        inputs = inputs_of.setdefault(output_file, set())
+        resolved = Path(input_file).resolve()
+        if resolved in inputs:  # listed twice
+            continue
+        inputs.add(resolved)
+        jobs.append((str(input_file), output_file))
+    # inputs that mirror to the same output path would overwrite each other, none of them is run
+    collisions = {output_file for output_file, inputs in inputs_of.items() if len(inputs) > 1}
+    failed = {
+        (input_file, output_file): BatchResult(input_file, output_file, "Duplicate output path, other inputs map to it")
+        for input_file, output_file in jobs if output_file in collisions
+    }
+    for input_file, output_file in failed:
+        LOG.warning("Skip - several inputs map to %s: %s", output_file, input_file)
+    results = iter(_run_jobs([job for job in jobs if job not in failed], input_filter, workers, run_kwargs))
+    return [failed[job] if job in failed else next(results) for job in jobs]
+
+
+def _run_jobs(
+        jobs: List[Tuple[str, str]],
+        input_filter: SectionFilter | None,
+        workers: int | None,
+        run_kwargs: dict
+) -> List[BatchResult]:
+    """Run (input file, output file) jobs, returns a result per job in order"""
+    if workers == 1:
+        return [_run_job(input_file, output_file, input_filter, run_kwargs) for input_file, output_file in jobs]
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_run_job, input_file, output_file, input_filter, run_kwargs)
+            for input_file, output_file in jobs
+        ]
+        for (input_file, output_file), future in zip(jobs, futures):
+            try:
+                results.append(future.result())
+            except Exception as e:  # a worker died
+                results.append(BatchResult(input_file, output_file, f"{type(e).__name__}: {e}"))
+    return results
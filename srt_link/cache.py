@@ -0,0 +1,86 @@
+from __future__ import annotations
+from os import PathLike
+from pathlib import Path
+import hashlib
+import json
+import logging
+import os
+import tempfile
+
+from srt_link import __version__
+from srt_link.models.input_filter import SectionFilter
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_MAX_SIZE: int = 256 * 1024 * 1024
+
+
+class ResultCache:
+    """Content addressed on-disk cache of cleaned outputs
+
+    Entries are keyed by a hash of the input bytes, the filter configuration, the run options, and the library
+    version. The least recently used entries are evicted once the cache grows over its size limit.
+    """
+
+    def __init__(self, path: str | PathLike, max_size: int = DEFAULT_MAX_SIZE):
+        self.path = Path(path)
+        self.max_size = max_size
+
+    @staticmethod
+    def key(contents: bytes, input_filter: SectionFilter | None = None, **options) -> str:
+        config = input_filter.config if input_filter else None
+        if config:
+            # skip lists are matched as sets, their order does not change the output
+            config = {
+                name: sorted(value) if name in ("faces_to_skip", "text_to_skip") and value else value
+                for name, value in config.items()
+            }
+        header = json.dumps({"version": __version__, "filter": config, "options": options}, sort_keys=True)
+        digest = hashlib.sha256(header.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(contents)
+        return digest.hexdigest()
+
+    def entry(self, key: str) -> Path:
+        return self.path / f"{key}.srt"
+
+    def get(self, key: str) -> str | None:
+        entry = self.entry(key)
+        try:
+            cleaned = entry.read_bytes().decode("utf-8")
+            os.utime(entry)     # mark as recently used
+        except FileNotFoundError:
+            return None
+        LOG.debug("Cache hit: %s", key)
+        return cleaned
+
+    def put(self, key: str, cleaned: str) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=self.path, suffix=".tmp", delete=False) as fd:
+            fd.write(cleaned.encode("utf-8"))
+        os.replace(fd.name, self.entry(key))
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove the least recently used entries until the cache fits its size limit"""
+        entries = []
+        for entry in os.scandir(self.path):
+            if entry.name.endswith(".srt"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        size = sum(entry_size for _, entry_size, _ in entries)
+        for _, entry_size, entry_path in sorted(entries):
+            if size <= self.max_size:
+                break
+            try:
+                os.remove(entry_path)
+            except FileNotFoundError:
+                pass
+            size -= entry_size
+
+    def clear(self) -> None:
+        if not self.path.is_dir():
+            return
+        for entry in os.scandir(self.path):
+            if entry.name.endswith((".srt", ".tmp")):
+                os.remove(entry.path)
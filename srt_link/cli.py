@@ -0,0 +1,245 @@
+from __future__ import annotations
+from argparse import ArgumentParser, HelpFormatter
+from typing import Dict
+import logging
+import sys
+
+from srt_link.models.input_filter import DEFAULT_PROFILE, SectionFilter, load_profiles
+from srt_link.pipeline import ENGINES, LINKED_ENGINE, NUMPY_ENGINE, SWEEP_ENGINE, run
+
+LOG_FORMATTER = '>>> %(message)s'
+LOG = logging.getLogger("srt_link")
+
+
+def parse():
+    parser = ArgumentParser(
+        description='SRT-Link: filter, merge, and order SubRip file sections',
+        formatter_class=lambda prog: HelpFormatter("srt_link", max_help_position=50)
+    )
+    parser.add_argument('input_file', nargs='*',
+                        help="srt input file paths, '-' for stdin, many inputs are merged into one output. "
+                             "With --batch: files, directories, and globs")
+    parser.add_argument('-o', '--output', dest='output_file', required=False,
+                        help='output file [default=stdout]. With --batch: output directory')
+    parser.add_argument('--parentheses', dest="filter_parentheses", default=True, action="store_true",
+                        help="filter parentheses [default=True]")
+    parser.add_argument('--curly-brackets', dest="filter_curly_brackets", default=True, action="store_true",
+                        help="filter curly brackets [default=True]")
+    parser.add_argument('--angle-brackets', dest="filter_angle_brackets", default=True, action="store_true",
+                        help="filter angle brackets [default=True]")
+    parser.add_argument('--square-brackets', dest="filter_square_brackets", default=True, action="store_true",
+                        help="filter square brackets [default=True]")
+    parser.add_argument('--max-digits', dest="max_digits", default=10, type=int,
+                        help="max number of digits allowed [default=10]")
+    parser.add_argument('--min-duration', dest="min_duration", default=0.3, type=float,
+                        help="min section duration in seconds [default=0.3]")
+    parser.add_argument('--faces', dest="faces_to_skip", default=None, type=str,
+                        help="comma separated faces to filter")
+    parser.add_argument('--text', dest="text_to_skip", default=None, type=str,
+                        help="comma separates text to filter")
+    parser.add_argument('--engine', dest="engine", default=LINKED_ENGINE, choices=ENGINES,
+                        help="merge sections one by one (linked), all at once (sweep), or parse them in bulk with NumPy "
+                             "(numpy) [default=linked]")
+    parser.add_argument('--lookback', dest="lookback", default=None, type=float,
+                        help="stream output, max seconds a section may start before the latest one [default=off]")
+    parser.add_argument('--follow', dest="follow", default=False, action="store_true",
+                        help="tail a growing input file and write sections as soon as they are final")
+    parser.add_argument('--max-latency', dest="max_latency", default=2, type=float,
+                        help="with --follow: max seconds a section is held back [default=2]")
+    parser.add_argument('--rewrite', dest="rewrite", default=False, action="store_true",
+                        help="with --follow: rewrite the whole output atomically instead of appending to it")
+    parser.add_argument('--idle-timeout', dest="idle_timeout", default=None, type=float,
+                        help="with --follow: stop after this many seconds without new input [default=never]")
+    parser.add_argument('--compact', dest="compact", default=False, action="store_true",
+                        help="join touching sections with the same text and fold the ones shorter than --min-duration")
+    parser.add_argument('--batch', dest="batch", default=False, action="store_true",
+                        help="process many inputs in parallel, output paths mirror the input paths")
+    parser.add_argument('--manifest', dest="manifest", default=None, type=str,
+                        help="batch manifest file, one input per line")
+    parser.add_argument('--workers', dest="workers", default=None, type=int,
+                        help="batch or parallel worker processes [default=cpu count]")
+    parser.add_argument('--parallel', dest="parallel", default=False, action="store_true",
+                        help="split a single input file at gaps no section spans and clean the parts in parallel")
+    parser.add_argument('--serve', dest="serve", default=False, action="store_true",
+                        help="run a local server that cleans srt requests, see --socket and --port")
+    parser.add_argument('--socket', dest="socket_path", default=None, type=str, help="server unix socket path")
+    parser.add_argument('--port', dest="port", default=None, type=int, help="server tcp port on localhost")
+    parser.add_argument('--profiles', dest="profiles", default=None, type=str,
+                        help="json file of named filter profiles, the filter flags make the 'default' profile")
+    parser.add_argument('--input-profiles', dest="input_profiles", default=None, type=str,
+                        help="comma separated filter profile of every input [default=default]")
+    parser.add_argument('--output-profiles', dest="output_profiles", default=None, type=str,
+                        help="comma separated filter profiles, parse the input once and write <output>.<profile>.srt "
+                             "for every profile")
+    parser.add_argument('--cache', dest="cache_dir", default=None, type=str,
+                        help="cache directory, reuse the output of identical inputs and filters")
+    parser.add_argument('--cache-size', dest="cache_size", default=256, type=float,
+                        help="max cache size in MB, least recently used outputs are evicted [default=256]")
+    parser.add_argument('--refresh-cache', dest="refresh_cache", default=False, action="store_true",
+                        help="ignore cached outputs, run and cache again")
+    parser.add_argument('--clear-cache', dest="clear_cache", default=False, action="store_true",
+                        help="remove every cached output")
+    parser.add_argument('--stats', dest="stats", default=False, action="store_true",
+                        help="print the time of every stage and the section counters to stderr")
+    parser.add_argument('--cprofile', dest="cprofile", default=None, type=str,
+                        help="write a cProfile dump of the run, see the pstats module")
+    parser.add_argument('--debug', dest='debug_mode', default=False, action="store_true", help="print debug logs")
+    args = parser.parse_args()
+
+    if args.stats and (args.serve or args.batch or args.parallel or args.follow):
+        parser.error("--stats only reports single runs")
+    if args.clear_cache and not args.cache_dir:
+        parser.error("--clear-cache requires --cache")
+    if args.lookback is not None and args.engine != LINKED_ENGINE:
+        parser.error("--lookback requires the linked engine")
+    if args.compact and (args.follow or args.lookback is not None):
+        parser.error("--compact can't be used with --follow or --lookback")
+    if args.serve:
+        if not args.socket_path and args.port is None:
+            parser.error("--serve requires --socket or --port")
+        if args.batch or args.parallel or args.follow or args.input_profiles or args.output_profiles \
+                or args.lookback is not None or args.cache_dir or args.compact:
+            parser.error("--serve can't be used with --batch, --parallel, --follow, --input-profiles, "
+                         "--output-profiles, --lookback, --cache, or --compact")
+    elif args.batch:
+        if args.parallel or args.follow or args.input_profiles or args.output_profiles:
+            parser.error("--batch can't be used with --parallel, --follow, --input-profiles, or --output-profiles")
+        if not args.output_file:
+            parser.error("--batch requires an output directory (-o)")
+        if not args.input_file and not args.manifest:
+            parser.error("--batch requires input files or a manifest")
+    elif args.clear_cache and not args.input_file:
+        args.input_file = None
+    else:
+        if not args.input_file:
+            parser.error("expected an input_file")
+        if args.input_profiles:
+            args.input_profiles = args.input_profiles.split(",")
+            if len(args.input_profiles) != len(args.input_file):
+                parser.error("--input-profiles expects a profile per input_file")
+        args.input_file = args.input_file[0] if len(args.input_file) == 1 else args.input_file
+        if args.cache_dir and not isinstance(args.input_file, str):
+            parser.error("--cache takes a single input file")
+        if args.engine == NUMPY_ENGINE and not isinstance(args.input_file, str):
+            parser.error("--engine numpy takes a single input file")
+        if args.parallel or args.follow:
+            if not isinstance(args.input_file, str) or args.input_file == "-":
+                parser.error("--parallel and --follow require a single input file path")
+        if args.follow:
+            if args.parallel or args.cache_dir or args.engine != LINKED_ENGINE:
+                parser.error("--follow can't be used with --parallel, --cache, or another engine than linked")
+            if args.rewrite and not args.output_file:
+                parser.error("--rewrite requires an output file (-o)")
+        if args.parallel:
+            if args.lookback is not None or args.cache_dir or args.engine == NUMPY_ENGINE:
+                parser.error("--parallel can't be used with --lookback, --cache, or the numpy engine")
+        if args.output_profiles:
+            if args.input_profiles or args.parallel or args.follow or args.lookback is not None or args.cache_dir \
+                    or args.stats:
+                parser.error("--output-profiles can't be used with --input-profiles, --parallel, --follow, "
+                             "--lookback, --cache, or --stats")
+            if not args.output_file:
+                parser.error("--output-profiles requires an output file (-o)")
+            if args.engine not in (LINKED_ENGINE, SWEEP_ENGINE):
+                parser.error("--output-profiles requires the linked or sweep engine")
+            args.output_profiles = args.output_profiles.split(",")
+        if args.output_file and not args.output_file.endswith(".srt"):
+            args.output_file = args.output_file + ".srt"
+    args.faces_to_skip = args.faces_to_skip.split(",") if args.faces_to_skip else None
+    args.text_to_skip = args.text_to_skip.split(",") if args.text_to_skip else None
+    return args
+
+
+def setup_logging(debug_mode: bool = False) -> None:
+    """Log to stdout through the package logger, the root logger is left to the application"""
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter(LOG_FORMATTER))
+    LOG.addHandler(handler)
+    LOG.propagate = False
+    LOG.setLevel(logging.DEBUG if debug_mode else logging.WARNING)
+    LOG.debug(">>> SRT-LINK DEBUG ENABLED <<<")
+
+
+def main():
+    args = parse()
+    setup_logging(args.debug_mode)
+    if not args.cprofile:
+        return clean(args)
+    import cProfile
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(clean, args)
+    finally:
+        profiler.dump_stats(args.cprofile)
+        print(f"Profile written to {args.cprofile}", file=sys.stderr)
+
+
+def named_profiles(args, input_filter: SectionFilter) -> Dict[str, SectionFilter]:
+    """The filter flags make the default profile, `--profiles` adds named ones"""
+    profiles = {DEFAULT_PROFILE: input_filter}
+    if args.profiles:
+        profiles.update(load_profiles(args.profiles))
+    return profiles
+
+
+def clean(args) -> int:
+    input_filter = SectionFilter(**vars(args))
+    compact = args.min_duration if args.compact else None
+    cache = None
+    if args.cache_dir:
+        from srt_link.cache import ResultCache
+        cache = ResultCache(args.cache_dir, max_size=int(args.cache_size * 1024 * 1024))
+        if args.clear_cache:
+            cache.clear()
+    if args.input_file is None:    # only clear the cache
+        return 0
+    if args.serve:
+        # server and batch modes are imported on demand, most runs clean a single file
+        from srt_link.server import SRTServer
+        SRTServer(named_profiles(args, input_filter)).serve(socket_path=args.socket_path, port=args.port)
+        return 0
+    if args.batch:
+        from srt_link.batch import run_batch
+        results = run_batch(args.input_file, args.output_file, input_filter=input_filter, manifest=args.manifest,
+                            workers=args.workers, lookback=args.lookback, engine=args.engine, cache=cache,
+                            refresh_cache=args.refresh_cache, compact=compact)
+        for result in results:
+            if result.error:
+                print(f"FAILED {result.input_file}: {result.error}", file=sys.stderr)
+            else:
+                print(f"OK {result.input_file} -> {result.output_file}", file=sys.stderr)
+        failed = sum(1 for result in results if result.error)
+        print(f"{len(results) - failed} succeeded, {failed} failed", file=sys.stderr)
+        return 1 if failed else 0
+    if args.input_profiles or args.output_profiles:
+        profiles = named_profiles(args, input_filter)
+        unknown = [name for name in args.input_profiles or args.output_profiles if name not in profiles]
+        if unknown:
+            print(f"Unknown profiles: {','.join(unknown)}", file=sys.stderr)
+            return 1
+    if args.output_profiles:
+        from srt_link.profiles import profile_output, run_profiles
+        run_profiles(args.input_file, {name: profiles[name] for name in args.output_profiles},
+                     {name: profile_output(args.output_file, name) for name in args.output_profiles},
+                     engine=args.engine, workers=args.workers, compact=compact)
+        return 0
+    if args.input_profiles:
+        input_filter = [profiles[name] for name in args.input_profiles]
+        input_filter = input_filter[0] if len(input_filter) == 1 else input_filter
+    if args.follow:
+        from srt_link.follow import DEFAULT_LOOKBACK, follow
+        lookback = DEFAULT_LOOKBACK if args.lookback is None else args.lookback
+        follow(input_file=args.input_file, output_file=args.output_file, input_filter=input_filter,
+               lookback=lookback, max_latency=args.max_latency, rewrite=args.rewrite, idle_timeout=args.idle_timeout)
+        return 0
+    if args.parallel:
+        from srt_link.parallel import run_parallel
+        run_parallel(input_file=args.input_file, output_file=args.output_file, input_filter=input_filter,
+                     workers=args.workers, engine=args.engine, compact=compact)
+        return 0
+    stats = run(input_file=args.input_file, output_file=args.output_file, input_filter=input_filter,
+                lookback=args.lookback, engine=args.engine, cache=cache, refresh_cache=args.refresh_cache,
+                stats=args.stats, compact=compact)
+    if stats:
+        print(stats.report(), file=sys.stderr)
+    return 0
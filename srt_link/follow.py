@@ -0,0 +1,155 @@
+from __future__ import annotations
+from io import StringIO
+from os import PathLike
+from typing import TextIO
+import codecs
+import io
+import logging
+import sys
+import time
+
+from srt_link.models.base import SRTSections
+from srt_link.models.input_filter import SectionFilter
+from srt_link.models.reader import CHUNK_SIZE, SectionReader
+from srt_link.models.writer import atomic_output
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_LOOKBACK: float = 10
+DEFAULT_MAX_LATENCY: float = 2
+DEFAULT_POLL_INTERVAL: float = 0.2
+
+
+class Follower:
+    """Tail a growing srt file and publish its cleaned sections as they become final
+
+    New text is parsed as it's appended and merged in lookback streaming mode, a section is written once no later
+    section can be merged with it, see `SRTSections`. A section is held at most `max_latency` seconds: past that
+    the last section being typed and every merged section are forced out, later input that overlaps them is clipped
+    and text appended to a section that was already taken is dropped.
+
+    The output is appended to, or rewritten atomically with the whole cleaned file on every update.
+    """
+
+    def __init__(
+            self,
+            input_file: str | PathLike,
+            output_file: str | PathLike | TextIO | None = None,
+            input_filter: SectionFilter | None = None,
+            lookback: float = DEFAULT_LOOKBACK,
+            max_latency: float = DEFAULT_MAX_LATENCY,
+            rewrite: bool = False
+    ):
+        if rewrite and (output_file is None or hasattr(output_file, "write")):
+            raise ValueError("Rewriting the output requires an output path")
+        self.input_file = input_file
+        self.output_file = output_file
+        self.input_filter = input_filter
+        self.max_latency = max_latency
+        self.rewrite = rewrite
+        self.sections = SRTSections(lookback=lookback)
+        self.reader = SectionReader()
+        self.decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder("utf-8")(), translate=True)
+        self.published = StringIO()     # whole cleaned output, rewrite mode only
+        self.out_fd: TextIO | None = None
+        self.owns_output = False
+        self.last_input = time.monotonic()
+        self.held_since: float | None = None    # since when sections are waiting to be written
+
+    def feed(self, chunk: bytes) -> None:
+        now = time.monotonic()
+        self.last_input = now
+        for raw_section in self.reader.feed(self.decoder.decode(chunk)):
+            self.sections.add(raw_section, section_filter=self.input_filter)
+        self.publish()
+        if self.held_since is None and len(self.sections):
+            self.held_since = now
+
+    def tick(self) -> None:
+        """Force out the sections held for longer than the max latency"""
+        now = time.monotonic()
+        if self.reader.pending and now - self.last_input >= self.max_latency:
+            # the captioner paused, take the complete lines of the last section, it may have stopped mid-line
+            LOG.debug("Input idle for %.1fs, publish the pending section", now - self.last_input)
+            for raw_section in self.reader.flush_lines():
+                self.sections.add(raw_section, section_filter=self.input_filter)
+            self.publish(until=self.sections.tail.ets)
+        elif self.held_since is not None and now - self.held_since >= self.max_latency:
+            self.publish(until=self.sections.tail.ets)
+
+    def close(self) -> None:
+        """Publish everything, call once the input is done"""
+        for raw_section in self.reader.feed(self.decoder.decode(b"", final=True)) + self.reader.close():
+            self.sections.add(raw_section, section_filter=self.input_filter)
+        self.publish(until=self.sections.tail.ets)
+        if self.owns_output:
+            self.out_fd.close()
+
+    def publish(self, until: int | None = None) -> None:
+        fd = self.published if self.rewrite else self.output()
+        position = fd.tell() if self.rewrite else None
+        self.sections.flush(fd, until=until)
+        if not len(self.sections):
+            self.held_since = None
+        elif until is not None:
+            self.held_since = time.monotonic()
+        if self.rewrite and fd.tell() != position:
+            self.replace_output()
+
+    def output(self) -> TextIO:
+        if self.out_fd is None:
+            if self.output_file is None:
+                self.out_fd = sys.stdout
+            elif hasattr(self.output_file, "write"):
+                self.out_fd = self.output_file
+            else:
+                self.out_fd = open(self.output_file, 'w', encoding='utf-8')
+                self.owns_output = True
+        return self.out_fd
+
+    def replace_output(self) -> None:
+        with atomic_output(self.output_file) as fd:
+            fd.write(self.published.getvalue())
+
+    def follow(self, poll_interval: float = DEFAULT_POLL_INTERVAL, idle_timeout: float | None = None) -> None:
+        """Tail the input until it's idle for `idle_timeout` seconds, forever by default, or until interrupted"""
+        try:
+            with open(self.input_file, 'rb') as fd:
+                while True:
+                    chunk = fd.read(CHUNK_SIZE)
+                    if chunk:
+                        self.feed(chunk)
+                        continue
+                    if idle_timeout is not None and time.monotonic() - self.last_input >= idle_timeout:
+                        break
+                    self.tick()
+                    time.sleep(poll_interval)
+        except KeyboardInterrupt:
+            pass
+        self.close()
+
+
+def follow(
+        input_file: str | PathLike,
+        output_file: str | PathLike | TextIO | None = None,
+        input_filter: SectionFilter | None = None,
+        lookback: float = DEFAULT_LOOKBACK,
+        max_latency: float = DEFAULT_MAX_LATENCY,
+        rewrite: bool = False,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        idle_timeout: float | None = None
+) -> None:
+    """Clean a growing srt file as it's written, see `Follower`
+
+    Param:
+        input_file (str):               srt path
+        output_file:                    srt path or a file-like object [default=stdout]
+        input_filter (SectionFilter):   filter applied to every section before it is merged
+        lookback (float):               max seconds a section may start before the latest one
+        max_latency (float):            max seconds a section is held before it's written
+        rewrite (bool):                 rewrite the whole output atomically instead of appending to it
+        poll_interval (float):          seconds between checks for new input
+        idle_timeout (float):           stop after this many seconds without new input [default=never]
+    """
+    Follower(input_file, output_file, input_filter, lookback=lookback, max_latency=max_latency, rewrite=rewrite) \
+        .follow(poll_interval=poll_interval, idle_timeout=idle_timeout)
@@ -0,0 +1,179 @@
+from __future__ import annotations
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from os import PathLike
+from pathlib import Path
+from typing import List
+import logging
+import mmap
+import os
+import re
+import struct
+
+from srt_link.models.base import SRTSections
+from srt_link.models.input_filter import SectionFilter
+from srt_link.models.section import SEC_TO_MS, Section, ts_to_ms
+from srt_link.models.writer import atomic_output
+
+LOG = logging.getLogger(__name__)
+
+INDEX_SUFFIX = ".idx"
+# magic, indexed file size, indexed file mtime in ns, number of sections
+INDEX_HEADER = struct.Struct("<8sQqQ")
+INDEX_MAGIC = b"SRTIDX01"
+
+
+def decode_section(buffer: mmap.mmap, start: int, end: int) -> str:
+    """Decode a raw section from a mapped buffer without copying the buffer"""
+    view = memoryview(buffer)[start:end]
+    try:
+        return str(view, "utf-8").replace("\r\n", "\n")
+    finally:
+        view.release()
+
+
+class SectionIndex:
+    """Byte offsets and timestamps of the sections of a memory mapped srt file
+
+    The file is scanned for section headers once, the index keeps the offset, start and end of every section in file
+    order plus a start-ordered view for window lookups. The index can be saved next to the file and is reused until
+    the file changes. Sections are sliced from the mapped buffer and parsed only when a window asks for them.
+    """
+
+    HEADER_RE = re.compile(Section.HEADER_RE.pattern.replace(r"\n", r"\r?\n").encode("ascii"))
+
+    def __init__(self, path: str | PathLike):
+        self.path = Path(path)
+        self.size = 0
+        self.mtime_ns = 0
+        self.offsets = array("q")   # section offsets in file order, followed by the file size
+        self.sts = array("q")       # ms, in file order
+        self.ets = array("q")       # ms, in file order
+        self.order = array("q")     # file order indexes sorted by start
+        self.max_ets = array("q")   # ms, running max end along `order`
+        self.buffer: mmap.mmap | None = None
+
+    def __len__(self) -> int:
+        return len(self.sts)
+
+    @classmethod
+    def build(cls, path: str | PathLike) -> SectionIndex:
+        index = cls(path)
+        index.map()
+        if index.buffer is not None:
+            for match in cls.HEADER_RE.finditer(index.buffer):
+                index.offsets.append(match.start())
+                index.sts.append(ts_to_ms(match["sts"].decode("ascii")))
+                index.ets.append(ts_to_ms(match["ets"].decode("ascii")))
+        index.offsets.append(index.size)
+        index.order = array("q", sorted(range(len(index.sts)), key=index.sts.__getitem__))
+        index.max_ets = array("q", accumulate((index.ets[position] for position in index.order), max))
+        LOG.debug("Indexed %d sections: %s", len(index), index.path)
+        return index
+
+    @classmethod
+    def open(cls, path: str | PathLike, save: bool = True) -> SectionIndex:
+        """Load the saved index of a file if it's up to date, otherwise build it and save it when possible"""
+        try:
+            return cls.load(path)
+        except (OSError, ValueError, EOFError, struct.error) as e:    # missing, outdated or truncated
+            LOG.debug("Rebuild index: %s", e)
+        index = cls.build(path)
+        if save:
+            try:
+                index.save()
+            except OSError as e:
+                LOG.debug("Index not saved: %s", e)
+        return index
+
+    @classmethod
+    def load(cls, path: str | PathLike) -> SectionIndex:
+        index = cls(path)
+        stat = index.path.stat()
+        with open(index.index_path, 'rb') as fd:
+            magic, size, mtime_ns, count = INDEX_HEADER.unpack(fd.read(INDEX_HEADER.size))
+            if magic != INDEX_MAGIC:
+                raise ValueError(f"Not an index file: {index.index_path}")
+            if (size, mtime_ns) != (stat.st_size, stat.st_mtime_ns):
+                raise ValueError(f"Outdated index: {index.index_path}")
+            for values, length in (
+                    (index.offsets, count + 1), (index.sts, count), (index.ets, count),
+                    (index.order, count), (index.max_ets, count)
+            ):
+                values.fromfile(fd, length)
+        index.map()
+        return index
+
+    @property
+    def index_path(self) -> Path:
+        return self.path.with_name(self.path.name + INDEX_SUFFIX)
+
+    def save(self) -> None:
+        """Write the index next to the file, replaced atomically so a concurrent `load` never sees it partly written"""
+        with atomic_output(self.index_path, binary=True) as fd:
+            fd.write(INDEX_HEADER.pack(INDEX_MAGIC, self.size, self.mtime_ns, len(self)))
+            for values in (self.offsets, self.sts, self.ets, self.order, self.max_ets):
+                values.tofile(fd)
+
+    def map(self) -> None:
+        with open(self.path, 'rb') as fd:
+            stat = os.fstat(fd.fileno())
+            self.size, self.mtime_ns = stat.st_size, stat.st_mtime_ns
+            # an empty file can't be mapped and has no sections
+            self.buffer = mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ) if self.size else None
+
+    def close(self) -> None:
+        if self.buffer is not None:
+            self.buffer.close()
+            self.buffer = None
+
+    def __enter__(self) -> SectionIndex:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def window(self, start: int, end: int) -> List[int]:
+        """File order indexes of the sections that overlap [start, end) ms"""
+        # sections before `first` end before the window, sections from `last` start after it
+        first = bisect_right(self.max_ets, start)
+        last = bisect_left(self.order, end, key=self.sts.__getitem__)
+        return sorted(position for position in self.order[first:last] if self.ets[position] > start)
+
+    def raw_section(self, position: int) -> str:
+        return decode_section(self.buffer, self.offsets[position], self.offsets[position + 1])
+
+    def extract(self, start: float, end: float, input_filter: SectionFilter | None = None) -> SRTSections:
+        """Parse, filter and merge the sections that overlap a time window
+
+        Sections are filtered as a whole, then clipped to the window, the result matches the output of the whole file
+        over the window.
+
+        Param:
+            start (float):                  window start in seconds
+            end (float):                    window end in seconds
+            input_filter (SectionFilter):   filter applied to every section before it is merged
+        """
+        start_ms, end_ms = round(start * SEC_TO_MS), round(end * SEC_TO_MS)
+        sections = SRTSections()
+        for position in self.window(start_ms, end_ms):
+            section = Section.from_str(self.raw_section(position))
+            if input_filter:
+                input_filter.apply(section)
+            if section.skip:
+                continue
+            section.sts, section.ets = max(section.sts, start_ms), min(section.ets, end_ms)
+            sections.insert(section)
+        return sections
+
+
+def extract(
+        path: str | PathLike,
+        start: float,
+        end: float,
+        input_filter: SectionFilter | None = None
+) -> SRTSections:
+    """Filter, merge, and order the sections of a file that overlap a time window, see `SectionIndex.extract`"""
+    with SectionIndex.open(path) as index:
+        return index.extract(start, end, input_filter)
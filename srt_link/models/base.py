@@ -1,19 +1,37 @@
 from __future__ import annotations
-from datetime import time
-from typing import Iterator, TextIO
+from bisect import bisect_right
+from typing import Iterable, Iterator, List, TextIO
 import logging
 import sys
 
 from .input_filter import SectionFilter
-from .section import Section
+from .section import SEC_TO_MS, STARTS_BEFORE, Section, Tracer, log_tracer, ms_to_ts
+from .writer import write_file, write_sections
 
-LOG = logging.getLogger()
+LOG = logging.getLogger(__name__)
 
 
 class SRTSections:
-    def __init__(self):
-        self.head = Section(sts=time(0), ets=time(0), body="", skip=True)
+    def __init__(self, lookback: float | None = None, tracer: Tracer | None = None):
+        """
+        Param:
+            lookback (float):   streaming mode, max seconds a new section may start before the latest start seen.
+                                Sections that end before the latest start minus lookback are final and can be
+                                flushed, sections that arrive later than that are clipped or dropped.
+            tracer (Tracer):    called on every merge decision, defaults to debug logs when DEBUG is enabled
+        """
+        self.head = Section(sts=0, ets=0, body="", skip=True)
         self.tail = self.head
+        self.lookback = lookback
+        self.watermark = None       # ms, no section is expected to start before
+        self.flushed_until = None   # ms, end of the last flushed section
+        self.flushed = 0            # number of flushed sections
+        self.starts = []            # start of every linked section, sorted
+        self.sections = []          # linked sections, in the same order as `starts`
+        self.tracer = tracer or (log_tracer if LOG.isEnabledFor(logging.DEBUG) else None)
+
+    def __len__(self) -> int:
+        return len(self.sections)
 
     def iter_sections(self) -> Iterator[Section]:
         runner = self.head.next
@@ -23,18 +41,151 @@ class SRTSections:
 
     def add(self, section: str, section_filter: SectionFilter | None = None) -> None:
         """filter happens before insert"""
-        section = Section.from_str(section)
+        self.insert(Section.from_str(section), section_filter=section_filter)
+
+    def insert(self, section: Section, section_filter: SectionFilter | None = None) -> None:
+        """filter happens before insert"""
+        if self.lookback is not None:
+            watermark = section.sts - int(self.lookback * SEC_TO_MS)
+            self.watermark = watermark if self.watermark is None else max(self.watermark, watermark)
         if section_filter:
             section_filter.apply(section)
+        if not section.skip and self.flushed_until is not None and section.sts < self.flushed_until:
+            if section.ets <= self.flushed_until:
+                LOG.warning("Skip - section starts before flushed output: %s --> %s",
+                            ms_to_ts(section.sts), ms_to_ts(section.ets))
+                section.skip = True
+            else:
+                LOG.warning("Clip - section starts before flushed output: %s --> %s",
+                            ms_to_ts(section.sts), ms_to_ts(section.ets))
+                section.sts = self.flushed_until
         if not section.skip:
-            self.tail = self.tail.insert_after(section)
-        LOG.debug(f"Link Length: {len(list(self.iter_sections()))}\n")
+            self.splice(section)
+        LOG.debug("Link Length: %d\n", len(self.sections))
+
+    def index_section(self, section: Section) -> None:
+        """Index a newly linked section by its start, linked sections never change their start"""
+        index = bisect_right(self.starts, section.sts)
+        self.starts.insert(index, section.sts)
+        self.sections.insert(index, section)
+
+    def splice(self, section: Section) -> None:
+        """Insert a section after the last section that starts before it
+
+        Instead of delegating the new section backwards one section at a time, the insertion point is looked up in
+        the start index. A new section that reaches over the following sections is split at their starts and every
+        part is merged with the section it overlaps.
+        """
+        index = bisect_right(self.starts, section.sts)
+        runner = self.sections[index - 1] if index else self.head
+        while runner.next and runner.next.sts < section.ets:
+            following = runner.next
+            if self.tracer:
+                self.tracer(STARTS_BEFORE, following, section)
+            runner.insert_after(section.clone(sts=section.sts, ets=following.sts), self)
+            section.sts = following.sts
+            runner = following
+        last = runner.insert_after(section, self)
+        if last.next is None:
+            self.tail = last
+
+    def extend(self, sections: Iterable[Section]) -> None:
+        """Link ordered sections that overlap neither each other nor the tail, see `sweep`"""
+        for section in sections:
+            self.tail = self.tail.link_next(section, self)
+
+    def compact(self, min_duration: float = 0) -> int:
+        """Coalesce the fragments left by the overlap splitting, returns the number of sections saved
+
+        Touching sections with the same body are joined. A section shorter than `min_duration` seconds is folded into
+        the touching neighbor that shares the most lines with it, the previous one on a tie: the neighbor takes over
+        its time span and keeps its own body. A short section that touches no other is kept. Runs in linear time.
+        """
+        before = len(self.sections)
+        self._coalesce()
+        if min_duration > 0:
+            runner = self.head.next
+            while runner:
+                following = runner.next
+                if runner.duration < min_duration:
+                    prev = runner.prev if runner.prev is not self.head and runner.prev.ets == runner.sts else None
+                    after = following if following and following.sts == runner.ets else None
+                    if prev and after:
+                        lines = set(runner.lines)
+                        if len(lines.intersection(after.lines)) > len(lines.intersection(prev.lines)):
+                            prev = None
+                    if prev:
+                        prev.ets = runner.ets
+                        self._unlink(runner)
+                    elif after:
+                        after.sts = runner.sts
+                        self._unlink(runner)
+                runner = following
+            self._coalesce()
+        # starts moved, index again
+        self.sections = list(self.iter_sections())
+        self.starts = [section.sts for section in self.sections]
+        return before - len(self.sections)
+
+    def _coalesce(self) -> None:
+        runner = self.head.next
+        while runner and runner.next:
+            following = runner.next
+            if following.sts == runner.ets and following.body == runner.body:
+                runner.ets = following.ets
+                self._unlink(following)
+            else:
+                runner = following
+
+    def _unlink(self, section: Section) -> None:
+        section.prev.next = section.next
+        if section.next:
+            section.next.prev = section.prev
+        else:
+            self.tail = section.prev
+        section.prev = section.next = None
+
+    def flush(self, fd: TextIO | None = None, until: int | None = None) -> None:
+        """Dump and unlink the sections that no new section can be merged with, see `lookback`
+
+        Param:
+            fd (TextIO):    output [default=stdout]
+            until (int):    ms, also dump the sections that end by then, later sections are clipped or dropped
+        """
+        final = self.pop_final(until)
+        if not final:
+            return
+        fd = fd or sys.stdout
+        write_sections(fd, final, start=self.flushed + 1)
+        self.flushed += len(final)
+        fd.flush()
+
+    def pop_final(self, until: int | None = None) -> List[Section]:
+        """Unlink and return the sections that no new section can be merged with, see `flush`"""
+        watermark = self.watermark if until is None else max(until, self.watermark or until)
+        if watermark is None:
+            return []
+        runner = self.head.next
+        if not runner or runner.ets > watermark:
+            return []
+        final = []
+        while runner and runner.ets <= watermark:
+            final.append(runner)
+            self.flushed_until = runner.ets
+            # unlink so flushed sections are freed right away
+            runner.prev, runner.next, runner = None, None, runner.next
+        del self.starts[:len(final)]
+        del self.sections[:len(final)]
+        self.head.next = runner
+        if runner:
+            runner.prev = self.head
+        else:
+            self.tail = self.head
+        return final
 
     def dump_to_file(self, path: str) -> None:
-        with open(path, 'w') as fd:
-            self.dump(fd)
+        """Dump to a utf-8 file, replaced atomically once complete"""
+        write_file(path, self.iter_sections(), start=self.flushed + 1)
 
     def dump(self, fd: TextIO | None = None) -> None:
-        fd = fd or sys.stdout
-        for runner_id, section in enumerate(self.iter_sections(), start=1):
-            fd.write(f"{runner_id}\n{section}\n\n")
+        write_sections(fd or sys.stdout, self.iter_sections(), start=self.flushed + 1)
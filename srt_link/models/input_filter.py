@@ -1,11 +1,22 @@
 from __future__ import annotations
-from typing import List
+from typing import Dict, List, Tuple
+import json
 import logging
 import re
 
+from .matcher import TextMatcher
 from .section import Section
 
-LOG = logging.getLogger()
+LOG = logging.getLogger(__name__)
+
+DEFAULT_PROFILE = "default"     # the profile made of the command line filter flags
+
+# filter rules that skip a section
+TEXT_RULE = "text"
+FACE_RULE = "face"
+MAX_DIGITS_RULE = "max_digits"
+MIN_DURATION_RULE = "min_duration"
+FILTER_RULES = (TEXT_RULE, FACE_RULE, MAX_DIGITS_RULE, MIN_DURATION_RULE)
 
 
 class SectionFilter:
@@ -14,6 +25,9 @@ class SectionFilter:
     RE_IGN_CURLY_BRACKETS   = r'{[^}]*?}'
     RE_IGN_SQUARE_BRACKETS  = r'\[[^\]]*?\]'
     RE_IGN_PARENTHESES      = r'\([^)]*?\)'
+    RE_DIGIT                = r'(?P<digit>[0-9])'
+
+    FONT_FACE_RE = re.compile(RE_FONT_FACE)
 
     def __init__(
             self,
@@ -27,6 +41,17 @@ class SectionFilter:
             min_duration: float = 0.3,
             **kwargs
     ):
+        """Everything a section is matched against is compiled once here"""
+        self.config = {
+            "faces_to_skip": faces_to_skip,
+            "text_to_skip": text_to_skip,
+            "filter_parentheses": filter_parentheses,
+            "filter_curly_brackets": filter_curly_brackets,
+            "filter_angle_brackets": filter_angle_brackets,
+            "filter_square_brackets": filter_square_brackets,
+            "max_digits": max_digits,
+            "min_duration": min_duration,
+        }
         self.max_digits = max_digits
         self.min_duration = min_duration
         self.faces_to_skip = faces_to_skip
@@ -42,39 +67,80 @@ class SectionFilter:
             filters.append(self.RE_IGN_SQUARE_BRACKETS)
         self.brackets_filter = '|'.join(filters)
 
-    def font_filter(self, section: Section) -> bool:
-        if not self.faces_to_skip:
+        self.faces = frozenset(faces_to_skip or ())
+        self.text_matcher = TextMatcher(text_to_skip) if text_to_skip else None
+        # brackets are matched first so digits inside them are removed, not counted
+        self.strip_re = re.compile('|'.join(filters + [self.RE_DIGIT]))
+
+    def font_filter(self, section: Section, body: str | None = None) -> bool:
+        if not self.faces:
             return False
-        for face in re.compile(self.RE_FONT_FACE).findall(section.body):
-            if face in self.faces_to_skip:
-                LOG.debug(f"Skip - face filter matched: {face}")
+        for face in self.FONT_FACE_RE.findall(section.body if body is None else body):
+            if face in self.faces:
+                LOG.debug("Skip - face filter matched: %s", face)
                 return True
+        return False
 
-    def text_filter(self, section: Section) -> bool:
-        if not self.text_to_skip:
+    def text_filter(self, section: Section, body: str | None = None) -> bool:
+        if not self.text_matcher:
             return False
-        for text in self.text_to_skip:
-            if text in section.body:
-                LOG.debug(f"Skip - text filter matched: {text}")
-                return True
+        text = self.text_matcher.search(section.body if body is None else body)
+        if text is not None:
+            LOG.debug("Skip - text filter matched: %s", text)
+            return True
+        return False
 
-    def apply(self, section: Section) -> None:
+    def strip(self, body: str) -> Tuple[str, int]:
+        """Remove the brackets and count the remaining digits in a single pass"""
+        digits = 0
+
+        def keep_digit(match: re.Match) -> str:
+            nonlocal digits
+            if match.lastgroup == "digit":
+                digits += 1
+                return match.group()
+            return ''
+
+        return self.strip_re.sub(keep_digit, body), digits
+
+    def apply(self, section: Section) -> str | None:
+        """Filter a section in place, returns the rule that skipped it, None if it's kept
+
+        The duration is checked first, it only needs the header, a short section's body is never built.
+        """
+        # Duration filter
+        if section.duration < self.min_duration:
+            section.skip = True
+            LOG.debug("Skip - min duration: %s < %s", section.duration, self.min_duration)
+            return MIN_DURATION_RULE
+
+        body = section.body
         # Content filters
-        if self.text_filter(section) or self.font_filter(section):
+        if self.text_filter(section, body):
             section.skip = True
-            return
+            return TEXT_RULE
+        if self.font_filter(section, body):
+            section.skip = True
+            return FACE_RULE
 
         # Brackets filter
-        section.body = re.compile(self.brackets_filter).sub('', section.body)
+        stripped, digits = self.strip(body)
 
         # Digits count filter
-        if len(re.sub("[^0-9]", "", section.body)) > self.max_digits:
+        if digits > self.max_digits:
             section.skip = True
-            LOG.debug(f"Skip - max digits: {len(re.sub('[^0-9]', '', section.body))} > {self.max_digits}")
-            return
+            LOG.debug("Skip - max digits: %d > %d", digits, self.max_digits)
+            return MAX_DIGITS_RULE
+        if stripped != body:
+            section.body = stripped
+        return None
 
-        # Duration filter
-        if section.duration < self.min_duration:
-            section.skip = True
-            LOG.debug(f"Skip - min duration: {section.duration} < {self.min_duration}")
-            return
+
+def load_profiles(path: str) -> Dict[str, SectionFilter]:
+    """Load named filter profiles from a json file mapping profile names to `SectionFilter` arguments
+
+    {"default": {"faces_to_skip": ["narrator"], "max_digits": 6}, "kids": {"text_to_skip": ["damn"]}}
+    """
+    with open(path, 'r', encoding='utf-8') as fd:
+        profiles = json.load(fd)
+    return {name: SectionFilter(**kwargs) for name, kwargs in profiles.items()}
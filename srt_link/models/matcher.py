@@ -0,0 +1,65 @@
+from __future__ import annotations
+from collections import deque
+from typing import Dict, Iterable, List
+
+
+class TextMatcher:
+    """Multi-pattern substring matcher
+
+    Builds an Aho-Corasick automaton so a text is searched for all the patterns in a single pass, the search cost does
+    not grow with the number of patterns. Few patterns are searched with plain `in` checks, which are faster until
+    the per-character automaton walk pays off.
+    """
+
+    AUTOMATON_MIN_PATTERNS: int = 8
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns = list(dict.fromkeys(patterns))
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[str | None] = [None]
+        if len(self.patterns) >= self.AUTOMATON_MIN_PATTERNS and "" not in self.patterns:
+            self._build()
+
+    def _build(self) -> None:
+        for pattern in self.patterns:
+            state = 0
+            for char in pattern:
+                if char not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(None)
+                    self.goto[state][char] = len(self.goto) - 1
+                state = self.goto[state][char]
+            self.output[state] = self.output[state] or pattern
+
+        # breadth first, the fail state of a state is the state of its longest proper suffix
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fail = self.fail[state]
+                while fail and char not in self.goto[fail]:
+                    fail = self.fail[fail]
+                self.fail[next_state] = self.goto[fail].get(char, 0)
+                # a state also matches the patterns that end at its suffix
+                self.output[next_state] = self.output[next_state] or self.output[self.fail[next_state]]
+
+    def search(self, text: str) -> str | None:
+        """Returns a pattern found in the text, None if there's none"""
+        if len(self.goto) == 1:
+            for pattern in self.patterns:
+                if pattern in text:
+                    return pattern
+            return None
+
+        goto, fail, output = self.goto, self.fail, self.output
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state] is not None:
+                return output[state]
+        return None
@@ -0,0 +1,126 @@
+from __future__ import annotations
+from contextlib import contextmanager
+from os import PathLike
+from typing import Iterable, Iterator, List, TextIO
+import codecs
+import io
+import sys
+
+from .section import Section
+
+CHUNK_SIZE: int = 64 * 1024
+
+
+class SectionReader:
+    """Incremental SubRip parser
+
+    Text is fed in arbitrary chunks, a raw section is returned as soon as the header of the
+    section that follows it is seen. The buffer only holds the pending (last) section.
+    """
+
+    # a header that straddles two chunks ends with "\nHH:MM:SS,mmm --> HH:MM:SS,mmm"
+    HEADER_TS_LEN: int = 30
+
+    def __init__(self):
+        self.buffer = ""
+        self.pending = False    # buffer starts with a section header
+        self.scan_pos = 0       # headers before this position were already matched
+
+    def feed(self, chunk: str) -> List[str]:
+        """Add a chunk of text, returns the raw sections completed by it"""
+        pos = max(self.scan_pos, len(self.buffer) - self.HEADER_TS_LEN)
+        self.buffer += chunk
+        # step back to the first digit of a section id split between chunks
+        while pos > self.scan_pos and self.buffer[pos - 1].isdecimal():
+            pos -= 1
+
+        sections = []
+        start = None
+        for match in Section.HEADER_RE.finditer(self.buffer, pos):
+            if self.pending:
+                sections.append(self.buffer[start or 0:match.start()])
+            self.pending = True
+            start = match.start()
+            self.scan_pos = match.end()
+        if start:
+            self.buffer = self.buffer[start:]
+            self.scan_pos -= start
+        return sections
+
+    def flush_lines(self) -> List[str]:
+        """Take the pending section up to its last complete line, for an input that paused
+
+        A trailing partial line stays buffered, and so do the lines after the last blank line, they may be the start
+        of the next section header. Text that follows a taken section before the next header is dropped.
+        """
+        if not self.pending:
+            return []
+        end = self.buffer.rfind("\n\n", self.scan_pos)
+        if end != -1 and self.buffer[end + 2:].strip():
+            end += 2
+        else:
+            end = self.buffer.rfind("\n") + 1
+            if end <= self.scan_pos:    # the body has no complete line yet
+                return []
+        section = self.buffer[:end]
+        self.buffer = self.buffer[end:]
+        self.pending = False
+        self.scan_pos = 0
+        return [section]
+
+    def close(self) -> List[str]:
+        """Flush the pending section, call once the input is exhausted"""
+        sections = [self.buffer] if self.pending else []
+        self.buffer = ""
+        self.pending = False
+        self.scan_pos = 0
+        return sections
+
+
+def iter_raw_sections(fd: TextIO, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """Yield the raw sections of a file-like object, reading it in chunks, see `iter_raw_chunks`"""
+    def chunks():
+        while chunk := fd.read(chunk_size):
+            yield chunk
+
+    return iter_raw_chunks(chunks())
+
+
+def iter_raw_chunks(chunks: Iterable[str | bytes]) -> Iterator[str]:
+    """Yield the raw sections of in-memory text given in chunks
+
+    Chunks are str or utf-8 bytes, both may be mixed in a document. Newlines are translated.
+    """
+    reader = SectionReader()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    newlines = io.IncrementalNewlineDecoder(None, translate=True)
+    for chunk in chunks:
+        if not isinstance(chunk, str):
+            chunk = utf8.decode(chunk)
+        yield from reader.feed(newlines.decode(chunk))
+    yield from reader.feed(newlines.decode(utf8.decode(b"", final=True), final=True))
+    yield from reader.close()
+
+
+@contextmanager
+def open_input(source: str | PathLike | TextIO) -> Iterator[TextIO]:
+    """Open an input path, `-` for stdin, or pass through an already open file-like object"""
+    if hasattr(source, "read"):
+        yield source
+    elif str(source) == "-":
+        with open(sys.stdin.fileno(), "r", encoding="utf-8", closefd=False) as fd:
+            yield fd
+    else:
+        with open(source, "r", encoding="utf-8") as fd:
+            yield fd
+
+
+def read_bytes(source: str | PathLike | TextIO) -> bytes:
+    """Read a whole input path, `-` for stdin, or file-like object as bytes"""
+    if hasattr(source, "read"):
+        contents = source.read()
+        return contents.encode("utf-8") if isinstance(contents, str) else contents
+    if str(source) == "-":
+        return sys.stdin.buffer.read()
+    with open(source, 'rb') as fd:
+        return fd.read()
@@ -1,23 +1,65 @@
 from __future__ import annotations
-import datetime
+from typing import TYPE_CHECKING, Callable, List, Set
 import logging
 import re
 
-LOG = logging.getLogger()
+if TYPE_CHECKING:
+    from .base import SRTSections
+
+LOG = logging.getLogger(__name__)
 
 SEC_TO_MS: int = 1000
 MIN_TO_MS: int = SEC_TO_MS * 60
 HOUR_TO_MS: int = MIN_TO_MS * 60
 
+# merge decision events, named after the README cases
+LINK = "link"
+STARTS_BEFORE = "starts_before"
+SAME_START_EXACT = "same_start_exact"
+SAME_START_ENDS_BEFORE = "same_start_ends_before"
+SAME_START_ENDS_AFTER = "same_start_ends_after"
+START_BEFORE_SAME_END = "start_before_same_end"
+START_BEFORE_ENDS_AFTER = "start_before_ends_after"
+START_BEFORE_ENDS_BEFORE = "start_before_ends_before"
+MERGE_EVENTS = (
+    LINK, STARTS_BEFORE,
+    SAME_START_EXACT, SAME_START_ENDS_BEFORE, SAME_START_ENDS_AFTER,
+    START_BEFORE_SAME_END, START_BEFORE_ENDS_AFTER, START_BEFORE_ENDS_BEFORE,
+)
+
+# tracer(event, self, other), called with the sections involved in a merge decision
+Tracer = Callable[[str, "Section", "Section"], None]
+
+
+def log_tracer(event: str, this: Section, other: Section) -> None:
+    LOG.debug("%s: %s --> %s, %s --> %s", event,
+              ms_to_ts(this.sts), ms_to_ts(this.ets), ms_to_ts(other.sts), ms_to_ts(other.ets))
+
+
+def ts_to_ms(ts: str) -> int:
+    """HH:MM:SS,mmm timestamp to milliseconds"""
+    digits = int(ts.replace(":", "").replace(",", ""))   # HHMMSSmmm
+    return digits // 10_000_000 * HOUR_TO_MS + digits // 100_000 % 100 * MIN_TO_MS + digits % 100_000
+
+
+def ms_to_ts(ms: int) -> str:
+    """Milliseconds to HH:MM:SS,mmm timestamp"""
+    hours, ms = divmod(ms, HOUR_TO_MS)
+    minutes, ms = divmod(ms, MIN_TO_MS)
+    seconds, ms = divmod(ms, SEC_TO_MS)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d},{ms:03d}"
+
 
 class Section:
     HEADER_RE = re.compile(r"(?P<id>\d+)\n(?P<sts>\d{2}:\d{2}:\d{2},\d{3}) --> (?P<ets>\d{2}:\d{2}:\d{2},\d{3})")
     HEADER_TS_RE = re.compile(r'(?P<sts>\d{2}:\d{2}:\d{2},\d{3}) --> (?P<ets>\d{2}:\d{2}:\d{2},\d{3})')
 
+    __slots__ = ("prev", "next", "sts", "ets", "_lines", "seen", "skip", "source", "body_start", "body_end")
+
     def __init__(
             self,
-            sts: datetime.time,             # start timestamp
-            ets: datetime.time,             # end timestamp
+            sts: int,                       # start timestamp in ms
+            ets: int,                       # end timestamp in ms
             body: str,                      # subtitles text
             skip: bool = False,             # ignore on dump
             _prev: Section | None = None,   # prev srt section
@@ -27,19 +69,56 @@ class Section:
         self.next = _next
         self.sts = sts
         self.ets = ets
-        self.body = body.strip("\n")
+        self._lines: List[str] | None = None    # body lines, merged lines are appended once
+        self.seen: Set[str] | None = None       # lines membership, created on the first merge
+        self.source: str | None = None          # text the body is sliced from on demand, see `lazy`
+        self.body_start = self.body_end = 0
+        self.body = body
         self.skip = skip
 
+    @classmethod
+    def lazy(cls, sts: int, ets: int, source: str, body_start: int, body_end: int) -> Section:
+        """A section whose body is sliced from the source text only when it's first needed"""
+        section = cls.__new__(cls)
+        section.prev = section.next = None
+        section.sts, section.ets = sts, ets
+        section._lines = section.seen = None
+        section.source, section.body_start, section.body_end = source, body_start, body_end
+        section.skip = False
+        return section
+
+    @property
+    def lines(self) -> List[str]:
+        if self._lines is None:
+            self._lines = self.source[self.body_start:self.body_end].strip("\n").split("\n")
+            self.source = None
+        return self._lines
+
+    @lines.setter
+    def lines(self, lines: List[str]) -> None:
+        self._lines = lines
+        self.source = None
+
+    @property
+    def body(self) -> str:
+        if self._lines is None:
+            return self.source[self.body_start:self.body_end].strip("\n")
+        return '\n'.join(self._lines)
+
+    @body.setter
+    def body(self, body: str) -> None:
+        self.lines = body.strip("\n").split("\n")
+        self.seen = None
+
     @property
     def duration(self):
-        ets_ms = (self.ets.hour * HOUR_TO_MS + self.ets.minute * MIN_TO_MS +
-                  self.ets.second * SEC_TO_MS + self.ets.microsecond // 1000)
-        sts_ms = (self.sts.hour * HOUR_TO_MS + self.sts.minute * MIN_TO_MS +
-                  self.sts.second * SEC_TO_MS + self.sts.microsecond // 1000)
-        return (ets_ms - sts_ms) / SEC_TO_MS
-
-    def link_next(self, other: Section) -> Section:
-        LOG.debug(f"Linking: {self.sts} --> {self.ets} to {other.sts} --> {other.ets}")
+        return (self.ets - self.sts) / SEC_TO_MS
+
+    def link_next(self, other: Section, sections: SRTSections | None = None) -> Section:
+        if sections is not None:
+            sections.index_section(other)
+            if sections.tracer:
+                sections.tracer(LINK, self, other)
         if self.next:
             self.next.prev = other
             other.next = self.next
@@ -47,31 +126,33 @@ class Section:
         other.prev = self
         return other
 
-    def insert_before(self, other: Section) -> Section:
-        return self.prev.insert_after(other)
+    def insert_before(self, other: Section, sections: SRTSections | None = None) -> Section:
+        return self.prev.insert_after(other, sections)
 
-    def insert_after(self, other: Section) -> Section:
-        LOG.debug(f"Self: {self.sts} --> {self.ets}")
-        LOG.debug(f"Other: {other.sts} --> {other.ets}")
+    def insert_after(self, other: Section, sections: SRTSections | None = None) -> Section:
+        """Insert a section after this one and resolve their overlap
+
+        Param:
+            other (Section):            the section to insert
+            sections (SRTSections):     the list this section belongs to, indexes linked sections and gets trace events
+        Returns:
+            The last section of the resolved overlap
+        """
         if self.ets > other.sts:
-            LOG.debug(f"Overlap: self.ets={self.ets} > other.sts={other.sts}")
             if self.sts > other.sts:
-                LOG.debug(f"Delegating: self.sts={self.sts} > other.sts={other.sts}")
-                forward_overlap = self._handle_starts_after(other)
+                forward_overlap = self._handle_starts_after(other, sections)
                 if forward_overlap is None:
                     return self
                 other = forward_overlap
             if self.sts == other.sts:
-                LOG.debug(f"Same start: self.sts={self.sts} == other.sts={other.sts}")
-                return self._handle_same_start(other)
+                return self._handle_same_start(other, sections)
             elif self.sts < other.sts:
-                LOG.debug(f"Forward overlap: self.sts={self.sts} < other.sts={other.sts}")
-                return self._handle_start_before(other)
+                return self._handle_start_before(other, sections)
             else:
                 raise ValueError("Unexpected error...")
-        return self.link_next(other)
+        return self.link_next(other, sections)
 
-    def _handle_starts_after(self, other: Section) -> Section | None:
+    def _handle_starts_after(self, other: Section, sections: SRTSections | None = None) -> Section | None:
         """Handle a new section that starts before this section
         
         > Initial state
@@ -96,15 +177,17 @@ class Section:
             The overlap with this section if any, otherwise None
         """
 
-        delegated_section = Section(sts=other.sts, ets=min(self.sts, other.ets), body=other.body)
+        if sections is not None and sections.tracer:
+            sections.tracer(STARTS_BEFORE, self, other)
+        delegated_section = other.clone(sts=other.sts, ets=min(self.sts, other.ets))
         delegated_section.next = self
-        self.insert_before(delegated_section)
+        self.insert_before(delegated_section, sections)
         if self.sts >= other.ets:
             return None
         other.sts = self.sts
         return other
 
-    def _handle_same_start(self, other: Section) -> Section:
+    def _handle_same_start(self, other: Section, sections: SRTSections | None = None) -> Section:
         """Handle a new section that starts at the same time as this section
 
         ############################################
@@ -159,22 +242,27 @@ class Section:
         """
         
         if self.ets == other.ets:
-            LOG.debug(f"Same start case 1: self.ets={self.ets} == other.ets={other.ets}")
-            self.body = self.get_merged_body(other)
+            if sections is not None and sections.tracer:
+                sections.tracer(SAME_START_EXACT, self, other)
+            self.merge_lines(other.lines)
             return self
         elif self.ets > other.ets:
-            LOG.debug(f"Same start case 2: self.ets={self.ets} > other.ets={other.ets}")
+            if sections is not None and sections.tracer:
+                sections.tracer(SAME_START_ENDS_BEFORE, self, other)
             other.sts = other.ets
             self.ets, other.ets = other.ets, self.ets
-            other.body, self.body = self.body, self.get_merged_body(other)
-            return self.link_next(other)
+            other_lines = other.lines
+            other.lines, other.seen = self.lines[:], None
+            self.merge_lines(other_lines)
+            return self.link_next(other, sections)
         else:
-            LOG.debug(f"Same start case 3: self.ets={self.ets} < other.ets={other.ets}")
+            if sections is not None and sections.tracer:
+                sections.tracer(SAME_START_ENDS_AFTER, self, other)
             other.sts = self.ets
-            self.body = self.get_merged_body(other)
-            return self.link_next(other)
+            self.merge_lines(other.lines)
+            return self.link_next(other, sections)
 
-    def _handle_start_before(self, other: Section) -> Section:
+    def _handle_start_before(self, other: Section, sections: SRTSections | None = None) -> Section:
         """Handle a new section that starts after this section
 
         ############################################
@@ -231,41 +319,61 @@ class Section:
         """
 
         if self.ets == other.ets:
-            LOG.debug(f"Forward overlap case 1: self.ets={self.ets} == other.ets={other.ets}")
+            if sections is not None and sections.tracer:
+                sections.tracer(START_BEFORE_SAME_END, self, other)
             self.ets = other.sts
-            other.body = self.body if other.body in self.body else '\n'.join([self.body, other.body])
-            return self.link_next(other)
+            other_lines = other.lines
+            other.lines, other.seen = self.lines[:], None
+            other.merge_lines(other_lines)
+            return self.link_next(other, sections)
         elif self.ets < other.ets:
-            LOG.debug(f"Forward overlap case 2: self.ets={self.ets} < other.ets={other.ets}")
-            new_section = Section(sts=other.sts, ets=self.ets, body=other.body)
+            if sections is not None and sections.tracer:
+                sections.tracer(START_BEFORE_ENDS_AFTER, self, other)
+            new_section = other.clone(sts=other.sts, ets=self.ets)
             other.sts = self.ets
-            return self.insert_after(new_section).link_next(other)
+            return self.insert_after(new_section, sections).link_next(other, sections)
         else:
-            LOG.debug(f"Forward overlap case 3: self.ets={self.ets} > other.ets={other.ets}")
-            new_section = Section(sts=other.ets, ets=self.ets, body=self.body)
+            if sections is not None and sections.tracer:
+                sections.tracer(START_BEFORE_ENDS_BEFORE, self, other)
+            new_section = self.clone(sts=other.ets, ets=self.ets)
             self.ets = other.ets
-            return self.insert_after(other).link_next(new_section)
-
-    def get_merged_body(self, other: Section) -> str:
-        if other.body in self.body:
-            LOG.debug("Same body, no merge")
-            return self.body
-        LOG.debug("Merged bodies")
-        return '\n'.join([self.body, other.body])
+            return self.insert_after(other, sections).link_next(new_section, sections)
+
+    def merge_lines(self, lines: List[str]) -> None:
+        """Append the lines this body doesn't have yet, in order"""
+        seen = self.seen
+        if seen is None:
+            seen = self.seen = set(self.lines)
+        for line in lines:
+            if line not in seen:
+                seen.add(line)
+                self.lines.append(line)
+
+    def clone(self, sts: int, ets: int) -> Section:
+        """A new unlinked section over another time span with a copy of this section's body"""
+        if self._lines is None:
+            # not read yet, share the source text
+            return Section.lazy(sts, ets, self.source, self.body_start, self.body_end)
+        section = Section.__new__(Section)
+        section.prev = section.next = None
+        section.sts, section.ets = sts, ets
+        section._lines, section.seen, section.source = self.lines[:], None, None
+        section.skip = False
+        return section
 
     def __str__(self) -> str:
         return "{sts} --> {ets}\n{body}".format(
-            sts=self.sts.isoformat(timespec="milliseconds").replace(".", ","),
-            ets=self.ets.isoformat(timespec="milliseconds").replace(".", ","),
+            sts=ms_to_ts(self.sts),
+            ets=ms_to_ts(self.ets),
             body=self.body.lstrip("\n").replace("\n\n", "\n")
         )
 
     @classmethod
     def from_str(cls, section: str) -> Section:
-        lines = section.split("\n")
-        sts, ets = cls.HEADER_TS_RE.match(lines[1]).groups()
-        return cls(
-            sts=datetime.time.fromisoformat(sts.replace(",", ".")),
-            ets=datetime.time.fromisoformat(ets.replace(",", ".")),
-            body='\n'.join(lines[2:])
-        )
+        """Parse the header of a raw section, the body is kept as offsets into it"""
+        header_start = section.index("\n") + 1
+        header_end = section.find("\n", header_start)
+        if header_end == -1:
+            header_end = len(section)
+        sts, ets = cls.HEADER_TS_RE.match(section, header_start).groups()
+        return cls.lazy(ts_to_ms(sts), ts_to_ms(ets), section, header_end + 1, len(section))
@@ -0,0 +1,47 @@
+from __future__ import annotations
+from bisect import bisect_left, insort
+from typing import Iterable, Iterator
+
+from .section import Section
+
+
+def sweep(sections: Iterable[Section]) -> Iterator[Section]:
+    """Resolve the overlaps of all sections in a single sweep over their sorted boundaries
+
+    Every boundary splits the timeline into segments, the body of a segment merges the bodies of the sections
+    that cover it in input order, the same way `Section.insert_after` merges them one at a time:
+
+    |------------|          (A)
+        |---------|         (B)
+          |---|             (C)
+    |---|-|---|--|-|
+     (A)  (A+B+C) (B)
+        (A+B) (A+B)
+
+    Sections without a positive duration cover no segment and are dropped.
+
+    Param:
+        sections (Iterable[Section]):   filtered sections in input order
+    Returns:
+        Ordered, non-overlapping sections
+    """
+    sections = [section for section in sections if section.ets > section.sts]
+    events = []
+    for index, section in enumerate(sections):
+        events.append((section.sts, 1, index))
+        events.append((section.ets, 0, index))
+    events.sort()
+
+    active = []     # input indexes of the sections covering the current segment
+    segment_start = 0
+    for ts, is_start, index in events:
+        if active and ts != segment_start:
+            segment = sections[active[0]].clone(sts=segment_start, ets=ts)
+            for other in active[1:]:
+                segment.merge_lines(sections[other].lines)
+            yield segment
+        segment_start = ts
+        if is_start:
+            insort(active, index)
+        else:
+            del active[bisect_left(active, index)]
@@ -0,0 +1,155 @@
+from __future__ import annotations
+from collections import Counter
+from typing import Callable, List, Tuple
+import time
+
+from .base import SRTSections
+from .input_filter import MIN_DURATION_RULE, SectionFilter
+from .section import HOUR_TO_MS, MIN_TO_MS, SEC_TO_MS, Section
+
+try:
+    import numpy as np
+except ImportError:     # optional dependency, see `available`
+    np = None
+
+# "HH:MM:SS,mmm --> HH:MM:SS,mmm", D is a digit
+HEADER_TS_TEMPLATE = b"DD:DD:DD,DDD --> DD:DD:DD,DDD"
+# padding so the bytes before the first header and after the last one can be indexed
+PADDING = 16
+
+# timer(parse, filter, merge), seconds spent in every stage
+Timer = Callable[[float, float, float], None]
+
+
+def available() -> bool:
+    return np is not None
+
+
+def header_arrays(buffer: bytes) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Find the section headers of a srt buffer in bulk, the same headers as `Section.HEADER_RE`
+
+    Returns:
+        Section byte offsets, starts and ends in ms, int64 arrays in file order
+    """
+    data = np.frombuffer(b"\n" * PADDING + buffer + b"\n" * PADDING, dtype=np.uint8)
+    template = np.frombuffer(HEADER_TS_TEMPLATE, dtype=np.uint8)
+    is_digit_slot = template == ord("D")
+    arrow = HEADER_TS_TEMPLATE.index(b" --> ")
+
+    # every '>' may be the arrow of a header, check the bytes around it against the template
+    candidates = np.flatnonzero(data == ord(">")) - (arrow + 3)
+    candidates = candidates[(candidates >= PADDING) & (candidates + len(template) <= len(data))]
+    windows = data[candidates[:, None] + np.arange(len(template))]
+    digits = windows - ord("0")
+    is_digit = digits <= 9      # unsigned, bytes below '0' wrap around
+    valid = np.all(np.where(is_digit_slot, is_digit, windows == template), axis=1)
+    # the id line ends right before the timestamps, with "\n" or "\r\n"
+    newline = candidates - 1
+    id_end = np.where(data[newline - 1] == ord("\r"), newline - 2, newline - 1)
+    valid &= (data[newline] == ord("\n")) & (data[id_end] - ord("0") <= 9)
+    candidates, digits, id_end = candidates[valid], digits[valid].astype(np.int64), id_end[valid]
+
+    # the id starts at the first digit of the run
+    starts = id_end.copy()
+    active = np.ones(len(starts), dtype=bool)
+    while active.any():
+        active &= data[starts - 1] - ord("0") <= 9
+        starts[active] -= 1
+
+    def to_ms(offset: int) -> np.ndarray:
+        hours = digits[:, offset] * 10 + digits[:, offset + 1]
+        minutes = digits[:, offset + 3] * 10 + digits[:, offset + 4]
+        seconds = digits[:, offset + 6] * 10 + digits[:, offset + 7]
+        ms = digits[:, offset + 9] * 100 + digits[:, offset + 10] * 10 + digits[:, offset + 11]
+        return hours * HOUR_TO_MS + minutes * MIN_TO_MS + seconds * SEC_TO_MS + ms
+
+    return starts - PADDING, to_ms(0), to_ms(arrow + 5)
+
+
+def read_sections(
+        buffer: bytes,
+        sections: SRTSections,
+        input_filter: SectionFilter | None = None,
+        timer: Timer | None = None,
+        skipped: Counter | None = None
+) -> int:
+    """Filter and merge the sections of a srt buffer, the same output as feeding them one by one
+
+    Timestamps are parsed in bulk and the min duration filter is applied to all of them at once, only the survivors
+    are decoded to `Section`. Sections are then grouped in time by quiescent gaps, a section alone in its group can't
+    overlap any other and is linked right away, the other groups go through the overlap resolution.
+
+    Param:
+        timer (Timer):      called with the time of every stage
+        skipped (Counter):  counts the skipped sections per filter rule
+    Returns:
+        The number of sections in the buffer
+    """
+    clock = time.perf_counter
+    start_time = clock()
+    offsets, sts, ets = header_arrays(buffer)
+    keep = np.ones(len(offsets), dtype=bool)
+    if input_filter:
+        keep &= (ets - sts) / SEC_TO_MS >= input_filter.min_duration
+    positions = np.flatnonzero(keep)
+    order = positions[np.argsort(sts[positions], kind="stable")]
+    sorted_sts, sorted_ets = sts[order], ets[order]
+    # a group starts where every earlier section ends by the next start, sections that start together always interact
+    group_start = np.ones(len(order), dtype=bool)
+    group_start[1:] = (np.maximum.accumulate(sorted_ets)[:-1] <= sorted_sts[1:]) & (sorted_sts[:-1] < sorted_sts[1:])
+    bounds = np.append(np.flatnonzero(group_start), len(order)).tolist()
+
+    ends = np.append(offsets[1:], len(buffer)).tolist()
+    offsets, order = offsets.tolist(), order.tolist()
+    if skipped is not None:
+        skipped[MIN_DURATION_RULE] += len(offsets) - len(positions)
+    if timer:
+        timer(clock() - start_time, 0.0, 0.0)
+
+    def section_at(position: int) -> Section:
+        raw_section = buffer[offsets[position]:ends[position]].decode("utf-8").replace("\r\n", "\n")
+        return Section.from_str(raw_section)
+
+    if timer or skipped is not None:
+        _link_groups_stats(sections, section_at, order, bounds, input_filter, timer, skipped)
+        return len(offsets)
+    for start, end in zip(bounds, bounds[1:]):
+        if end - start == 1:
+            section = section_at(order[start])
+            if input_filter:
+                input_filter.apply(section)
+            if not section.skip:
+                sections.tail = sections.tail.link_next(section, sections)
+            continue
+        for position in sorted(order[start:end]):
+            sections.insert(section_at(position), section_filter=input_filter)
+    return len(offsets)
+
+
+def _link_groups_stats(
+        sections: SRTSections,
+        section_at: Callable[[int], Section],
+        order: List[int],
+        bounds: List[int],
+        input_filter: SectionFilter | None,
+        timer: Timer | None,
+        skipped: Counter | None
+) -> None:
+    """The linking of `read_sections` that times every stage and counts the skipped sections"""
+    clock = time.perf_counter
+    for start, end in zip(bounds, bounds[1:]):
+        for position in (order[start],) if end - start == 1 else sorted(order[start:end]):
+            parse_start = clock()
+            section = section_at(position)
+            filter_start = clock()
+            rule = input_filter.apply(section) if input_filter else None
+            merge_start = clock()
+            if rule:
+                if skipped is not None:
+                    skipped[rule] += 1
+            elif end - start == 1:
+                sections.tail = sections.tail.link_next(section, sections)
+            else:
+                sections.insert(section)
+            if timer:
+                timer(filter_start - parse_start, merge_start - filter_start, clock() - merge_start)
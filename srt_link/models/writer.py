@@ -0,0 +1,89 @@
+from __future__ import annotations
+from contextlib import contextmanager
+from os import PathLike
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, TextIO
+import os
+import secrets
+import stat
+
+from .section import HOUR_TO_MS, SEC_TO_MS, Section, ms_to_ts
+
+BATCH_SIZE: int = 4096              # sections joined per write
+BUFFER_SIZE: int = 1024 * 1024      # output file buffer
+
+DIGITS2 = [f"{number:02d}" for number in range(100)]
+DIGITS3 = [f"{number:03d}" for number in range(1000)]
+MAX_TABLE_MS = 100 * HOUR_TO_MS
+
+
+def format_ts(ms: int) -> str:
+    """`ms_to_ts` that looks up the zero padded fields instead of formatting them"""
+    if ms >= MAX_TABLE_MS:
+        return ms_to_ts(ms)
+    seconds = ms // SEC_TO_MS
+    return f"{DIGITS2[seconds // 3600]}:{DIGITS2[seconds // 60 % 60]}:{DIGITS2[seconds % 60]},{DIGITS3[ms % 1000]}"
+
+
+def write_sections(fd: TextIO, sections: Iterable[Section], start: int = 1) -> int:
+    """Write numbered sections in batches
+
+    Param:
+        fd (TextIO):                    output
+        sections (Iterable[Section]):   sections to write in order
+        start (int):                    number of the first section
+    Returns:
+        The number of the next section
+    """
+    batch = []
+    number = start
+    # a section usually starts where the previous one ends, its formatted end is reused
+    last_ms, last_ts = None, ""
+    for section in sections:
+        sts = last_ts if section.sts == last_ms else format_ts(section.sts)
+        last_ms, last_ts = section.ets, format_ts(section.ets)
+        body = section.body
+        # the body as `Section.__str__` writes it, only empty lines need cleaning
+        if body.startswith("\n") or "\n\n" in body:
+            body = body.lstrip("\n").replace("\n\n", "\n")
+        batch.append(f"{number}\n{sts} --> {last_ts}\n{body}\n\n")
+        number += 1
+        if len(batch) == BATCH_SIZE:
+            fd.write("".join(batch))
+            batch.clear()
+    if batch:
+        fd.write("".join(batch))
+    return number
+
+
+@contextmanager
+def atomic_output(path: str | PathLike, binary: bool = False) -> Iterator[TextIO | BinaryIO]:
+    """A file that replaces `path` atomically once the block completes, removed if the block fails, utf-8 by default"""
+    path = Path(path)
+    # created with the default mode so the umask applies, the umask itself is process wide state and is never read
+    while True:
+        temp_path = path.parent / f".{path.name}.{secrets.token_hex(6)}.tmp"
+        try:
+            fileno = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+            break
+        except FileExistsError:
+            continue
+    try:
+        with open(fileno, 'wb', buffering=BUFFER_SIZE) if binary else \
+                open(fileno, 'w', encoding='utf-8', buffering=BUFFER_SIZE) as fd:
+            yield fd
+        # keep the mode of the replaced file
+        try:
+            os.chmod(temp_path, stat.S_IMODE(os.stat(path).st_mode))
+        except FileNotFoundError:
+            pass
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def write_file(path: str | PathLike, sections: Iterable[Section], start: int = 1) -> int:
+    """Write numbered sections to a utf-8 file, the file is replaced atomically once complete, see `write_sections`"""
+    with atomic_output(path) as fd:
+        return write_sections(fd, sections, start)
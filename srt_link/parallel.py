@@ -0,0 +1,117 @@
+from __future__ import annotations
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from os import PathLike
+from typing import Iterable, List, TextIO, Tuple
+import logging
+import mmap
+import os
+
+from srt_link.index import SectionIndex, decode_section
+from srt_link.models.base import SRTSections
+from srt_link.models.input_filter import SectionFilter
+from srt_link.models.section import Section
+from srt_link.pipeline import LINKED_ENGINE, SWEEP_ENGINE, merge_sections, open_output
+
+LOG = logging.getLogger(__name__)
+
+CHUNKS_PER_WORKER: int = 4
+
+
+def split_points(index: SectionIndex, chunks: int) -> List[int]:
+    """Positions in `index.order` that split the sections into about `chunks` independent chunks
+
+    A split is only made at a quiescent gap, where every section that starts before the gap ends before the following
+    section starts. Sections only merge with the sections they overlap, so chunks never interact. Sections that start
+    together always interact, even an empty one.
+    """
+    points = []
+    step = max(len(index) // max(chunks, 1), 1)
+    target = step
+    for position in range(step, len(index)):
+        sts = index.sts[index.order[position]]
+        if position >= target and index.max_ets[position - 1] <= sts and index.sts[index.order[position - 1]] < sts:
+            points.append(position)
+            target = position + step
+    return points
+
+
+def _run_chunk(
+        path: str,
+        offsets: array,
+        input_filter: SectionFilter | None,
+        engine: str
+) -> List[Tuple[int, int, List[str]]]:
+    """Filter and merge a chunk of sections given as (start, end) byte offset pairs in file order
+
+    Returns:
+        (sts, ets, body lines) of the merged sections
+    """
+    sections = SRTSections()
+    with open(path, 'rb') as fd, mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        items = (
+            (Section.from_str(decode_section(buffer, start, end)), input_filter)
+            for start, end in zip(offsets[::2], offsets[1::2])
+        )
+        merge_sections(items, sections, engine)
+    return [(section.sts, section.ets, section.lines) for section in sections.iter_sections()]
+
+
+def _link(results: Iterable[List[Tuple[int, int, List[str]]]]) -> SRTSections:
+    """Link the merged chunks in order"""
+    sections = SRTSections()
+    for result in results:
+        for sts, ets, lines in result:
+            section = Section(sts=sts, ets=ets, body="")
+            section.lines = lines
+            sections.tail = sections.tail.link_next(section, sections)
+    return sections
+
+
+def run_parallel(
+        input_file: str | PathLike,
+        output_file: str | TextIO | None = None,
+        input_filter: SectionFilter | None = None,
+        workers: int | None = None,
+        engine: str = LINKED_ENGINE,
+        compact: float | None = None
+) -> None:
+    """Filter, merge, and order the sections of a single file over a process pool, see `srt_link.run`
+
+    The file is indexed and split at quiescent gaps, the chunks are cleaned by the workers and linked back in order.
+    The output is the same as the sequential run.
+
+    Param:
+        input_file (str):               srt path
+        output_file:                    srt path or a file-like object [default=stdout]
+        input_filter (SectionFilter):   filter applied to every section before it is merged
+        workers (int):                  worker processes [default=cpu count], 1 runs in this process
+        engine (str):                   merge engine of every chunk, linked or sweep
+        compact (float):                coalesce the merged fragments, see `SRTSections.compact`
+    """
+    if engine not in (LINKED_ENGINE, SWEEP_ENGINE):
+        raise ValueError(f"Chunks are merged with the linked or sweep engine, not {engine}")
+    workers = workers or os.cpu_count() or 1
+    with SectionIndex.open(input_file, save=False) as index:
+        bounds = [0, *split_points(index, workers * CHUNKS_PER_WORKER), len(index)]
+        chunks = []
+        for start, end in zip(bounds, bounds[1:]):
+            if start == end:    # no sections
+                continue
+            offsets = array("q")
+            for position in sorted(index.order[start:end]):
+                offsets.extend((index.offsets[position], index.offsets[position + 1]))
+            chunks.append(offsets)
+    LOG.debug("Split %d sections into %d chunks", len(index), len(chunks))
+
+    path = str(input_file)
+    if workers == 1:
+        sections = _link(_run_chunk(path, chunk, input_filter, engine) for chunk in chunks)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            sections = _link(pool.map(_run_chunk, repeat(path), chunks, repeat(input_filter), repeat(engine)))
+    if compact is not None:
+        LOG.info("Compaction saved %d sections", sections.compact(compact))
+    with open_output(output_file) as out_fd:
+        sections.dump(out_fd)
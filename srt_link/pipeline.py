@@ -0,0 +1,291 @@
+from __future__ import annotations
+from contextlib import contextmanager
+from io import BytesIO, StringIO, TextIOWrapper
+from typing import TYPE_CHECKING, Iterable, Iterator, Sequence, TextIO, Tuple
+import heapq
+import logging
+import sys
+import time
+
+from srt_link.models.base import SRTSections
+from srt_link.models.input_filter import SectionFilter
+from srt_link.models.reader import iter_raw_sections, open_input, read_bytes
+from srt_link.models.section import Section
+from srt_link.models.sweep import sweep
+from srt_link.models.writer import atomic_output
+from srt_link.stats import FILTER, MERGE, PARSE, READ, SERIALIZE, RunStats
+
+if TYPE_CHECKING:
+    from srt_link.cache import ResultCache
+
+LOG = logging.getLogger(__name__)
+
+LINKED_ENGINE = "linked"
+SWEEP_ENGINE = "sweep"
+NUMPY_ENGINE = "numpy"
+ENGINES = (LINKED_ENGINE, SWEEP_ENGINE, NUMPY_ENGINE)
+
+
+@contextmanager
+def open_output(output_file: str | TextIO | None = None, atomic: bool = True) -> Iterator[TextIO]:
+    """Open an output path, pass through an already open file-like object, stdout by default
+
+    Param:
+        output_file:    srt path or a file-like object [default=stdout]
+        atomic (bool):  a path is replaced atomically once the block completes, otherwise it is written in place
+    """
+    if output_file and not hasattr(output_file, "write"):
+        with atomic_output(output_file) if atomic else open(output_file, 'w', encoding='utf-8') as fd:
+            yield fd
+    else:
+        yield output_file or sys.stdout
+
+
+def iter_input(
+        input_file: str | TextIO,
+        input_filter: SectionFilter | None = None,
+        stats: RunStats | None = None
+) -> Iterator[Tuple[Section, SectionFilter | None]]:
+    """Yield the sections of an input with the filter to apply to them"""
+    with open_input(input_file) as fd:
+        raw_sections = iter_raw_sections(fd)
+        if stats is None:
+            for raw_section in raw_sections:
+                LOG.debug("Section: %s", raw_section.partition("\n")[0])
+                yield Section.from_str(raw_section), input_filter
+            return
+        clock = time.perf_counter
+        while True:
+            start = clock()
+            raw_section = next(raw_sections, None)
+            read = clock()
+            stats.times[READ] += read - start
+            if raw_section is None:
+                return
+            section = Section.from_str(raw_section)
+            stats.times[PARSE] += clock() - read
+            stats.sections_in += 1
+            yield section, input_filter
+
+
+def iter_inputs(
+        input_file: str | TextIO | Sequence[str | TextIO],
+        input_filter: SectionFilter | Sequence[SectionFilter | None] | None = None,
+        stats: RunStats | None = None
+) -> Iterator[Tuple[Section, SectionFilter | None]]:
+    """Yield the sections of one or many inputs with the filter to apply to them
+
+    Many inputs are merged by start in a single streaming pass, each input is expected to be mostly ordered.
+    Sections that start together keep the input order.
+
+    Param:
+        input_file:     an input, or a sequence of inputs
+        input_filter:   a filter for every input, or a sequence of filters, one per input
+        stats:          times the read and parse stages, and counts the sections
+    """
+    if not isinstance(input_file, (list, tuple)):
+        if not isinstance(input_filter, (list, tuple)):
+            return iter_input(input_file, input_filter, stats)
+        input_file = [input_file]
+    if isinstance(input_filter, (list, tuple)):
+        if len(input_filter) != len(input_file):
+            raise ValueError(f"Expected {len(input_file)} input filters, got {len(input_filter)}")
+        input_filters = input_filter
+    else:
+        input_filters = [input_filter] * len(input_file)
+    streams = [
+        iter_input(source, source_filter, stats) for source, source_filter in zip(input_file, input_filters)
+    ]
+    return heapq.merge(*streams, key=lambda item: item[0].sts)
+
+
+def merge_sections(
+        items: Iterable[Tuple[Section, SectionFilter | None]],
+        sections: SRTSections,
+        engine: str = LINKED_ENGINE,
+        flush_fd: TextIO | None = None,
+        stats: RunStats | None = None
+) -> None:
+    """Filter and merge sections with the linked or the sweep engine, every entry point merges through here
+
+    Param:
+        items:                          (section, filter to apply to it) pairs in input order
+        sections (SRTSections):         merged sections
+        engine (str):                   linked or sweep
+        flush_fd (TextIO):              linked engine, flush the final sections after every insert, see `lookback`
+        stats (RunStats):               times the filter and merge stages, and counts the skipped sections
+    """
+    if engine == SWEEP_ENGINE:
+        return _sweep_sections(items, sections, stats)
+    if stats is not None:
+        return _merge_sections_stats(items, sections, flush_fd, stats)
+    for section, section_filter in items:
+        sections.insert(section, section_filter=section_filter)
+        if flush_fd:
+            sections.flush(flush_fd)
+
+
+def _merge_sections_stats(
+        items: Iterable[Tuple[Section, SectionFilter | None]],
+        sections: SRTSections,
+        flush_fd: TextIO | None,
+        stats: RunStats
+) -> None:
+    """`merge_sections` that times every stage, the filter is applied before the insert to be timed on its own"""
+    clock = time.perf_counter
+    for section, section_filter in items:
+        start = clock()
+        rule = section_filter.apply(section) if section_filter else None
+        filtered = clock()
+        sections.insert(section)
+        merged = clock()
+        if flush_fd:
+            sections.flush(flush_fd)
+            stats.times[SERIALIZE] += clock() - merged
+        stats.times[FILTER] += filtered - start
+        stats.times[MERGE] += merged - filtered
+        if rule:
+            stats.skipped[rule] += 1
+
+
+def _sweep_sections(
+        items: Iterable[Tuple[Section, SectionFilter | None]],
+        sections: SRTSections,
+        stats: RunStats | None
+) -> None:
+    filtered = []
+    clock = time.perf_counter
+    for section, section_filter in items:
+        if section_filter:
+            start = clock() if stats else 0
+            rule = section_filter.apply(section)
+            if stats:
+                stats.times[FILTER] += clock() - start
+                if rule:
+                    stats.skipped[rule] += 1
+        if not section.skip:
+            filtered.append(section)
+    start = clock()
+    sections.extend(sweep(filtered))
+    if stats:
+        stats.times[MERGE] += clock() - start
+
+
+def read_sections(
+        input_file: str | TextIO | Sequence[str | TextIO],
+        sections: SRTSections,
+        input_filter: SectionFilter | Sequence[SectionFilter | None] | None = None,
+        flush_fd: TextIO | None = None,
+        stats: RunStats | None = None
+) -> None:
+    merge_sections(iter_inputs(input_file, input_filter, stats), sections, LINKED_ENGINE, flush_fd, stats)
+
+
+def sweep_sections(
+        input_file: str | TextIO | Sequence[str | TextIO],
+        sections: SRTSections,
+        input_filter: SectionFilter | Sequence[SectionFilter | None] | None = None,
+        stats: RunStats | None = None
+) -> None:
+    merge_sections(iter_inputs(input_file, input_filter, stats), sections, SWEEP_ENGINE, stats=stats)
+
+
+def run(
+        input_file: str | TextIO | Sequence[str | TextIO],
+        output_file: str | TextIO | None = None,
+        input_filter: SectionFilter | Sequence[SectionFilter | None] | None = None,
+        lookback: float | None = None,
+        engine: str = LINKED_ENGINE,
+        cache: ResultCache | None = None,
+        refresh_cache: bool = False,
+        stats: bool = False,
+        compact: float | None = None
+) -> RunStats | None:
+    """Filter, merge, and order the sections of an input
+
+    Param:
+        input_file:                     srt path, `-` for stdin, or a file-like object. Many inputs are merged
+                                        into a single output
+        output_file:                    srt path or a file-like object [default=stdout]
+        input_filter (SectionFilter):   filter applied to every section before it is merged, or a sequence of
+                                        filters, one per input
+        lookback (float):               stream the output, see `SRTSections`
+        engine (str):                   merge engine, one of `ENGINES`
+        cache (ResultCache):            reuse the output of a previous run on the same input and configuration
+        refresh_cache (bool):           ignore the cached output, run and cache the result again
+        stats (bool):                   time every stage and count the sections, filter rules and overlap cases
+        compact (float):                coalesce the merged fragments, folding the ones shorter than this many
+                                        seconds, see `SRTSections.compact`
+    Returns:
+        The `RunStats` of the run if asked for
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine: {engine}")
+    if engine != LINKED_ENGINE and lookback is not None:
+        raise ValueError("Lookback streaming requires the linked engine")
+    if compact is not None and lookback is not None:
+        raise ValueError("Compaction needs the whole output, it can't be used with lookback streaming")
+    if engine == NUMPY_ENGINE:
+        from srt_link.models import vectorized
+        if not vectorized.available():
+            raise ValueError("The numpy engine requires NumPy")
+        if isinstance(input_file, (list, tuple)) or isinstance(input_filter, (list, tuple)):
+            raise ValueError("The numpy engine takes a single input")
+    run_stats = RunStats() if stats else None
+    if run_stats and engine == SWEEP_ENGINE:
+        run_stats.cases = None
+    if cache is not None:
+        if isinstance(input_file, (list, tuple)) or isinstance(input_filter, (list, tuple)):
+            raise ValueError("The result cache takes a single input")
+        contents = read_bytes(input_file)
+        key = cache.key(contents, input_filter, lookback=lookback, engine=engine, compact=compact)
+        cleaned = None if refresh_cache else cache.get(key)
+        if cleaned is None:
+            output = StringIO()
+            run_stats = run(TextIOWrapper(BytesIO(contents), encoding='utf-8'), output, input_filter, lookback, engine,
+                            stats=stats, compact=compact)
+            cleaned = output.getvalue()
+            cache.put(key, cleaned)
+        elif run_stats:
+            run_stats.cache_hit = True
+        with open_output(output_file) as out_fd:
+            out_fd.write(cleaned)
+        return run_stats
+    tracer = run_stats.trace if run_stats and run_stats.cases is not None else None
+    sections = SRTSections(lookback=lookback, tracer=tracer)
+    if lookback is None:
+        if engine == SWEEP_ENGINE:
+            sweep_sections(input_file, sections, input_filter, stats=run_stats)
+        elif engine == NUMPY_ENGINE:
+            start = time.perf_counter()
+            contents = read_bytes(input_file)
+            if run_stats:
+                run_stats.times[READ] += time.perf_counter() - start
+                run_stats.sections_in += vectorized.read_sections(contents, sections, input_filter,
+                                                                  run_stats.add_times, run_stats.skipped)
+            else:
+                vectorized.read_sections(contents, sections, input_filter)
+        else:
+            read_sections(input_file, sections, input_filter, stats=run_stats)
+        if compact is not None:
+            start = time.perf_counter()
+            saved = sections.compact(compact)
+            LOG.info("Compaction saved %d sections", saved)
+            if run_stats:
+                run_stats.times[MERGE] += time.perf_counter() - start
+                run_stats.compacted = saved
+        start = time.perf_counter()
+        if hasattr(output_file, "write"):
+            sections.dump(output_file)
+        else:
+            sections.dump_to_file(output_file) if output_file else sections.dump()
+    else:
+        # the final sections are streamed to the output as they are flushed
+        with open_output(output_file, atomic=False) as out_fd:
+            read_sections(input_file, sections, input_filter, flush_fd=out_fd, stats=run_stats)
+            start = time.perf_counter()
+            sections.dump(out_fd)
+    if run_stats:
+        run_stats.times[SERIALIZE] += time.perf_counter() - start
+        run_stats.sections_out = sections.flushed + len(sections)
+    return run_stats
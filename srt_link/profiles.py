@@ -0,0 +1,107 @@
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from io import StringIO
+from os import PathLike
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence, TextIO, Tuple
+import logging
+
+from srt_link.models.base import SRTSections
+from srt_link.models.input_filter import SectionFilter
+from srt_link.models.section import Section
+from srt_link.models.writer import atomic_output
+from srt_link.pipeline import LINKED_ENGINE, SWEEP_ENGINE, iter_inputs, merge_sections
+
+LOG = logging.getLogger(__name__)
+
+# (sts, ets, body) of the parsed input sections, set once in every worker process
+_PARSED: List[Tuple[int, int, str]] = []
+
+
+def profile_output(output_file: str | PathLike, profile: str) -> Path:
+    """Output path of a profile, `out.srt` becomes `out.<profile>.srt`"""
+    path = Path(output_file)
+    return path.with_name(f"{path.stem}.{profile}{path.suffix or '.srt'}")
+
+
+def _clean(
+        sections: Iterable[Section],
+        input_filter: SectionFilter | None,
+        engine: str,
+        compact: float | None
+) -> SRTSections:
+    """Filter and merge unlinked sections of a single profile"""
+    merged = SRTSections()
+    merge_sections(((section, input_filter) for section in sections), merged, engine)
+    if compact is not None:
+        merged.compact(compact)
+    return merged
+
+
+def _init_worker(parsed: List[Tuple[int, int, str]]) -> None:
+    global _PARSED
+    _PARSED = parsed
+
+
+def _run_profile(input_filter: SectionFilter | None, engine: str, compact: float | None) -> str:
+    sections = (Section(sts=sts, ets=ets, body=body) for sts, ets, body in _PARSED)
+    output = StringIO()
+    _clean(sections, input_filter, engine, compact).dump(output)
+    return output.getvalue()
+
+
+def _write(sections: SRTSections, output: str | PathLike | TextIO) -> None:
+    if hasattr(output, "write"):
+        sections.dump(output)
+    else:
+        sections.dump_to_file(output)
+
+
+def run_profiles(
+        input_file: str | TextIO | Sequence[str | TextIO],
+        profiles: Dict[str, SectionFilter | None],
+        outputs: Dict[str, str | PathLike | TextIO],
+        engine: str = LINKED_ENGINE,
+        workers: int | None = 1,
+        compact: float | None = None
+) -> None:
+    """Clean an input once per filter profile, the input is read and parsed a single time
+
+    Every profile filters and merges its own copies of the parsed sections, a copy shares the body text of the parsed
+    section until its filter changes it. With many workers the parsed sections are sent once to every worker process,
+    not once per profile.
+
+    Param:
+        input_file:                     srt path, `-` for stdin, or a file-like object, or a sequence of inputs
+        profiles:                       filter of every profile by name
+        outputs:                        srt path or file-like object of every profile
+        engine (str):                   merge engine, linked or sweep
+        workers (int):                  worker processes, None for the cpu count [default=1, in this process]
+        compact (float):                coalesce the merged fragments, see `SRTSections.compact`
+    """
+    if engine not in (LINKED_ENGINE, SWEEP_ENGINE):
+        raise ValueError(f"Profiles are merged with the linked or sweep engine, not {engine}")
+    missing = [name for name in profiles if name not in outputs]
+    if missing:
+        raise ValueError(f"No output for profiles: {','.join(missing)}")
+    parsed = [section for section, _ in iter_inputs(input_file)]
+    LOG.debug("Parsed %d sections for %d profiles", len(parsed), len(profiles))
+
+    if workers == 1 or len(profiles) == 1:
+        for name, input_filter in profiles.items():
+            sections = (section.clone(section.sts, section.ets) for section in parsed)
+            _write(_clean(sections, input_filter, engine, compact), outputs[name])
+        return
+
+    shared = [(section.sts, section.ets, section.body) for section in parsed]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(shared,)) as pool:
+        futures = {
+            name: pool.submit(_run_profile, input_filter, engine, compact) for name, input_filter in profiles.items()
+        }
+        for name, future in futures.items():
+            output = outputs[name]
+            if hasattr(output, "write"):
+                output.write(future.result())
+            else:
+                with atomic_output(output) as fd:
+                    fd.write(future.result())
@@ -0,0 +1,121 @@
+from __future__ import annotations
+from io import StringIO
+from typing import Dict
+import asyncio
+import json
+import logging
+import socket
+
+from srt_link.api import clean
+from srt_link.models.input_filter import DEFAULT_PROFILE, SectionFilter
+from srt_link.pipeline import LINKED_ENGINE, run
+
+LOG = logging.getLogger(__name__)
+
+MAX_REQUEST_SIZE: int = 256 * 1024 * 1024
+
+
+class ServerError(Exception):
+    pass
+
+
+class SRTServer:
+    """Long running SRT-Link server, keeps its filter profiles compiled between requests
+
+    The protocol is json lines over a unix socket or a local tcp port, a connection may send many requests:
+        request:    {"srt": "<srt contents>" | "path": "<srt path>", "profile": "<name>", "engine": "<engine>"}
+        response:   {"ok": true, "srt": "<cleaned srt>"} or {"ok": false, "error": "<error>"}
+    Requests are cleaned on the default executor so connections are served concurrently.
+    """
+
+    def __init__(self, profiles: Dict[str, SectionFilter], default_profile: str = DEFAULT_PROFILE):
+        self.profiles = profiles
+        self.default_profile = default_profile
+
+    def clean(self, request: dict) -> str:
+        profile = request.get("profile") or self.default_profile
+        if profile not in self.profiles:
+            raise ValueError(f"Unknown profile: {profile}")
+        engine = request.get("engine", LINKED_ENGINE)
+        if "srt" in request:
+            return clean(request["srt"], self.profiles[profile], engine=engine)
+        if "path" not in request:
+            raise ValueError("Request has neither srt nor path")
+        output = StringIO()
+        run(input_file=request["path"], output_file=output, input_filter=self.profiles[profile], engine=engine)
+        return output.getvalue()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            while line := await reader.readline():
+                try:
+                    srt = await loop.run_in_executor(None, self.clean, json.loads(line))
+                    response = {"ok": True, "srt": srt}
+                except Exception as e:
+                    LOG.debug("Request failed: %s", e)
+                    response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+                writer.write(json.dumps(response).encode("utf-8") + b"\n")
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def start(
+            self,
+            socket_path: str | None = None,
+            host: str = "127.0.0.1",
+            port: int | None = None
+    ) -> asyncio.AbstractServer:
+        if socket_path:
+            return await asyncio.start_unix_server(self.handle, path=socket_path, limit=MAX_REQUEST_SIZE)
+        return await asyncio.start_server(self.handle, host=host, port=port, limit=MAX_REQUEST_SIZE)
+
+    def serve(self, socket_path: str | None = None, host: str = "127.0.0.1", port: int | None = None) -> None:
+        """Serve until interrupted"""
+        async def serve_forever():
+            server = await self.start(socket_path=socket_path, host=host, port=port)
+            LOG.warning("SRT-Link serving on %s", socket_path or f"{host}:{port}")
+            async with server:
+                await server.serve_forever()
+
+        try:
+            asyncio.run(serve_forever())
+        except KeyboardInterrupt:
+            pass
+
+
+class SRTClient:
+    """Blocking client for `SRTServer`"""
+
+    def __init__(self, socket_path: str | None = None, host: str = "127.0.0.1", port: int | None = None):
+        if socket_path:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.connect(socket_path)
+        else:
+            self.sock = socket.create_connection((host, port))
+        self.fd = self.sock.makefile("rwb")
+
+    def clean(self, srt: str | None = None, path: str | None = None, profile: str | None = None, **kwargs) -> str:
+        request = {"srt": srt} if srt is not None else {"path": path}
+        if profile:
+            request["profile"] = profile
+        request.update(kwargs)
+        self.fd.write(json.dumps(request).encode("utf-8") + b"\n")
+        self.fd.flush()
+        line = self.fd.readline()
+        if not line:
+            raise ServerError("Connection closed by server")
+        response = json.loads(line)
+        if not response["ok"]:
+            raise ServerError(response["error"])
+        return response["srt"]
+
+    def close(self) -> None:
+        self.fd.close()
+        self.sock.close()
+
+    def __enter__(self) -> SRTClient:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
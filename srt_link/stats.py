@@ -0,0 +1,75 @@
+from __future__ import annotations
+from collections import Counter
+
+from srt_link.models.input_filter import FILTER_RULES
+from srt_link.models.section import MERGE_EVENTS, Section
+
+READ = "read"
+PARSE = "parse"
+FILTER = "filter"
+MERGE = "merge"
+SERIALIZE = "serialize"
+STAGES = (READ, PARSE, FILTER, MERGE, SERIALIZE)
+
+
+class RunStats:
+    """Wall time per stage and counters of a run, see `srt_link.run`
+
+    Attributes:
+        times:          seconds spent in every stage of `STAGES`
+        sections_in:    parsed sections
+        sections_out:   written sections
+        skipped:        skipped sections per filter rule
+        cases:          merge decisions per overlap case, named after the README cases, None for the sweep engine
+                        that resolves the overlaps in a single pass without pairwise decisions
+        cache_hit:      the output was reused from the result cache
+        compacted:      sections saved by the compaction, see `SRTSections.compact`
+    """
+
+    def __init__(self):
+        self.times = dict.fromkeys(STAGES, 0.0)
+        self.sections_in = 0
+        self.sections_out = 0
+        self.skipped = Counter()
+        self.cases: Counter | None = Counter()
+        self.cache_hit = False
+        self.compacted = 0
+
+    def add_times(self, parse: float, filtering: float, merge: float) -> None:
+        """`Timer` of the numpy engine, see `srt_link.models.vectorized`"""
+        self.times[PARSE] += parse
+        self.times[FILTER] += filtering
+        self.times[MERGE] += merge
+
+    def trace(self, event: str, this: Section, other: Section) -> None:
+        """`Tracer` that counts the overlap cases"""
+        self.cases[event] += 1
+
+    def as_dict(self) -> dict:
+        return {
+            "times": dict(self.times),
+            "sections_in": self.sections_in,
+            "sections_out": self.sections_out,
+            "skipped": {rule: self.skipped[rule] for rule in FILTER_RULES},
+            "cases": None if self.cases is None else {event: self.cases[event] for event in MERGE_EVENTS},
+            "cache_hit": self.cache_hit,
+            "compacted": self.compacted,
+        }
+
+    def report(self) -> str:
+        total = sum(self.times.values())
+        lines = ["stage        seconds      %"]
+        for name, seconds in self.times.items():
+            lines.append(f"{name:<10} {seconds:>9.4f} {seconds / total * 100 if total else 0:>6.1f}")
+        lines.append(f"{'total':<10} {total:>9.4f}")
+        lines.append(f"sections in: {self.sections_in}, out: {self.sections_out}"
+                     + (" (cached)" if self.cache_hit else "")
+                     + (f", compacted: {self.compacted}" if self.compacted else ""))
+        lines.append("skipped:")
+        lines.extend(f"  {rule:<26} {self.skipped[rule]}" for rule in FILTER_RULES)
+        if self.cases is None:
+            lines.append("overlap cases: not counted by the sweep engine")
+        else:
+            lines.append("overlap cases:")
+            lines.extend(f"  {event:<26} {self.cases[event]}" for event in MERGE_EVENTS)
+        return "\n".join(lines)
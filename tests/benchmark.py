@@ -0,0 +1,132 @@
+"""SRT-Link throughput benchmark
+
+Synthesizes SubRip files with `generate_test_srts.synthesize` and measures every stage on its own:
+parse, filter, merge, and dump. Rates are per section the stage works on: the merge gets the sections kept by the
+filter, the dump the merged sections. Prints JSON results, run from the repository root:
+
+    python -m tests.benchmark --sizes 1000,100000 --overlap 0.2 --disorder 0.05 -o bench.json
+"""
+from __future__ import annotations
+from argparse import ArgumentParser
+from io import StringIO
+from typing import Any, Callable, Dict, List
+import json
+import platform
+import time
+import tracemalloc
+
+from srt_link import __version__
+from srt_link.models.base import SRTSections
+from srt_link.models.input_filter import SectionFilter
+from srt_link.models.reader import iter_raw_sections
+from srt_link.models.section import Section
+from srt_link.pipeline import merge_sections
+from tests.generate_test_srts import synthesize
+
+STAGES = ("parse", "filter", "merge", "dump")
+
+
+def parse_stage(contents: str) -> List[Section]:
+    return [Section.from_str(section) for section in iter_raw_sections(StringIO(contents))]
+
+
+def filter_stage(sections: List[Section], section_filter: SectionFilter) -> List[Section]:
+    for section in sections:
+        section_filter.apply(section)
+    return sections
+
+
+def merge_stage(sections: List[Section], engine: str) -> SRTSections:
+    merged = SRTSections()
+    merge_sections(((section, None) for section in sections), merged, engine)
+    return merged
+
+
+def dump_stage(merged: SRTSections) -> str:
+    fd = StringIO()
+    merged.dump(fd)
+    return fd.getvalue()
+
+
+def bench(size: int, overlap: float, disorder: float, tags: float, engine: str, memory: bool, seed: int) -> List[dict]:
+    contents = synthesize(size, overlap=overlap, disorder=disorder, tags=tags, seed=seed)
+    section_filter = SectionFilter(faces_to_skip=["FACE SKIP 1"], text_to_skip=["TEXT-SKIP"])
+    # stages mutate their input, every run gets a fresh input from the stages before it
+    prepare: Dict[str, Callable[[], Any]] = {
+        "parse": lambda: contents,
+        "filter": lambda: parse_stage(contents),
+        "merge": lambda: filter_stage(parse_stage(contents), section_filter),
+        "dump": lambda: merge_stage(filter_stage(parse_stage(contents), section_filter), engine),
+    }
+    stages: Dict[str, Callable[[Any], Any]] = {
+        "parse": parse_stage,
+        "filter": lambda sections: filter_stage(sections, section_filter),
+        "merge": lambda sections: merge_stage(sections, engine),
+        "dump": dump_stage,
+    }
+    # sections each stage works on: merge only gets the kept sections, dump the merged ones
+    processed: Dict[str, Callable[[Any, Any], int]] = {
+        "parse": lambda data, output: len(output),
+        "filter": lambda data, output: len(data),
+        "merge": lambda data, output: sum(not section.skip for section in data),
+        "dump": lambda data, output: len(data),
+    }
+
+    results = []
+    for stage in STAGES:
+        data = prepare[stage]()
+        start = time.perf_counter()
+        output = stages[stage](data)
+        seconds = time.perf_counter() - start
+        sections = processed[stage](data, output)
+        result = {
+            "stage": stage,
+            "engine": engine,
+            "size": size,
+            "sections": sections,
+            "seconds": seconds,
+            "sections_per_second": sections / seconds if seconds else None,
+        }
+        if memory:
+            # peak memory is measured on a second run since tracing slows it down
+            data = prepare[stage]()
+            tracemalloc.start()
+            stages[stage](data)
+            result["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        results.append(result)
+    return results
+
+
+def main():
+    parser = ArgumentParser(description="SRT-Link benchmark")
+    parser.add_argument('--sizes', default="1000,10000,100000", help="comma separated section counts")
+    parser.add_argument('--overlap', default=0.1, type=float, help="ratio of overlapping sections")
+    parser.add_argument('--disorder', default=0.0, type=float, help="ratio of out of order sections")
+    parser.add_argument('--tags', default=0.2, type=float, help="ratio of sections with tags")
+    parser.add_argument('--engine', default="linked", choices=("linked", "sweep"))
+    parser.add_argument('--no-memory', dest="memory", default=True, action="store_false",
+                        help="skip the peak memory runs")
+    parser.add_argument('--seed', default=0, type=int)
+    parser.add_argument('-o', '--output', default=None, help="output json file [default=stdout]")
+    args = parser.parse_args()
+
+    report = {
+        "version": __version__,
+        "python": platform.python_version(),
+        "config": {key: value for key, value in vars(args).items() if key != "output"},
+        "results": [],
+    }
+    for size in map(int, args.sizes.split(",")):
+        report["results"].extend(
+            bench(size, args.overlap, args.disorder, args.tags, args.engine, args.memory, args.seed)
+        )
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as fd:
+            json.dump(report, fd, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
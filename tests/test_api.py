@@ -0,0 +1,55 @@
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+from pathlib import Path
+
+import srt_link
+from srt_link import clean, clean_batch, iter_clean, run
+from srt_link.models.input_filter import SectionFilter
+from srt_link.models.writer import write_sections
+
+RAW = Path(__file__).parent / "raw.srt"
+
+
+def expected_output(contents: str, input_filter: SectionFilter | None = None) -> str:
+    output = StringIO()
+    run(StringIO(contents), output, input_filter)
+    return output.getvalue()
+
+
+def test_clean_text_bytes_and_chunks():
+    contents = RAW.read_text(encoding="utf-8")
+    section_filter = SectionFilter(text_to_skip=["TEXT-SKIP"])
+    expected = expected_output(contents, section_filter)
+    data = contents.encode("utf-8")
+    assert clean(contents, section_filter) == expected
+    assert clean(data, section_filter) == expected
+    assert clean(data.replace(b"\n", b"\r\n"), section_filter) == expected
+    # chunks split inside headers and multi-byte characters
+    assert clean([data[index:index + 7] for index in range(0, len(data), 7)], section_filter) == expected
+    assert clean(contents, section_filter, engine="sweep") == expected
+    # str and bytes chunks mixed, a multi-byte character split between bytes chunks
+    assert clean([contents[:100], "é".encode("utf-8")[:1], "é".encode("utf-8")[1:] + data[100:]], section_filter) \
+        == clean(contents[:100] + "é" + contents[100:], section_filter)
+
+
+def test_iter_clean_lookback_streams_like_run():
+    contents = RAW.read_text(encoding="utf-8")
+    output = StringIO()
+    run(StringIO(contents), output, lookback=1)
+    sections = iter_clean(contents, lookback=1)
+    first = next(sections)
+    assert first.next is None   # already final and unlinked
+    streamed = StringIO()
+    write_sections(streamed, [first, *sections])
+    assert streamed.getvalue() == output.getvalue()
+
+
+def test_concurrent_batches_share_a_filter():
+    contents = RAW.read_text(encoding="utf-8")
+    section_filter = SectionFilter(text_to_skip=["TEXT-SKIP"], faces_to_skip=["FACE SKIP 1"])
+    documents = [contents, contents.encode("utf-8"), contents[:len(contents) // 2]]
+    expected = [expected_output(contents, section_filter)] * 2 + [expected_output(documents[2], section_filter)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: clean_batch(documents, section_filter), range(32)))
+    assert all(result == expected for result in results)
+    assert srt_link.clean is clean
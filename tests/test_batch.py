@@ -0,0 +1,48 @@
+from pathlib import Path
+import shutil
+
+from srt_link.batch import run_batch
+from srt_link.models.input_filter import SectionFilter
+
+
+def test_batch(tmp_path):
+    raw_path = Path(__file__).parent / "raw.srt"
+    ref = (Path(__file__).parent / "ref.srt").read_text()
+    inputs = tmp_path / "in"
+    for name in ("a/one.srt", "a/b/two.srt", "three.srt"):
+        (inputs / name).parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy(raw_path, inputs / name)
+    manifest = tmp_path / "manifest.txt"
+    manifest.write_text("# extra inputs\nin/three.srt\nin/missing.srt\n")
+    section_filter = SectionFilter(faces_to_skip=["FACE SKIP 1", ], text_to_skip=["TEXT-SKIP", ])
+
+    results = run_batch([str(inputs / "a")], str(tmp_path / "out"), input_filter=section_filter,
+                        manifest=str(manifest), workers=2)
+
+    assert [Path(result.output_file).relative_to(tmp_path / "out").as_posix() for result in results] == [
+        "b/two.srt", "one.srt", "three.srt", "missing.srt"
+    ]
+    assert [result.error is None for result in results] == [True, True, True, False]
+    for result in results[:3]:
+        assert Path(result.output_file).read_text() == ref
+
+
+def test_batch_glob(tmp_path):
+    (tmp_path / "in" / "x").mkdir(parents=True)
+    shutil.copy(Path(__file__).parent / "raw.srt", tmp_path / "in" / "x" / "one.srt")
+    results = run_batch([str(tmp_path / "in" / "*" / "*.srt")], str(tmp_path / "out"), workers=1)
+    assert results[0].error is None
+    assert Path(results[0].output_file) == tmp_path / "out" / "x" / "one.srt"
+
+
+def test_batch_duplicate_outputs(tmp_path):
+    for name in ("a/ep.srt", "b/ep.srt", "c/ep.srt"):
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy(Path(__file__).parent / "raw.srt", tmp_path / name)
+    sources = [str(tmp_path / "a" / "ep.srt"), str(tmp_path / "b"), str(tmp_path / "c" / "ep.srt"),
+               str(tmp_path / "c" / "ep.srt")]
+    results = run_batch(sources, str(tmp_path / "out"), workers=1)
+    # the repeated input runs once, the inputs that map to the same output are all reported
+    assert len(results) == 3
+    assert all("Duplicate output path" in result.error for result in results)
+    assert not (tmp_path / "out" / "ep.srt").exists()
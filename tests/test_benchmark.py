@@ -0,0 +1,17 @@
+from tests.benchmark import STAGES, bench, parse_stage
+from tests.generate_test_srts import synthesize
+
+
+def test_synthesize():
+    contents = synthesize(500, overlap=0.3, disorder=0.2, tags=0.5, seed=1)
+    assert contents == synthesize(500, overlap=0.3, disorder=0.2, tags=0.5, seed=1)
+    assert len(parse_stage(contents)) == 500
+
+
+def test_bench():
+    results = bench(200, overlap=0.2, disorder=0.1, tags=0.2, engine="linked", memory=True, seed=0)
+    assert [result["stage"] for result in results] == list(STAGES)
+    assert all(result["sections_per_second"] and result["peak_bytes"] for result in results)
+    sections = {result["stage"]: result["sections"] for result in results}
+    assert sections["parse"] == sections["filter"] == 200
+    assert sections["merge"] < 200 and sections["dump"] != sections["merge"]
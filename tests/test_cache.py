@@ -0,0 +1,63 @@
+import os
+from pathlib import Path
+
+from srt_link import run
+from srt_link.cache import ResultCache
+from srt_link.models.input_filter import SectionFilter
+
+RAW_PATH = Path(__file__).parent / "raw.srt"
+REF_PATH = Path(__file__).parent / "ref.srt"
+
+
+def test_cache_hit_and_refresh(tmp_path):
+    cache = ResultCache(tmp_path / "cache")
+    section_filter = SectionFilter(faces_to_skip=["FACE SKIP 1", ], text_to_skip=["TEXT-SKIP", ])
+    out_path = tmp_path / "out.srt"
+    run(input_file=RAW_PATH, output_file=out_path, input_filter=section_filter, cache=cache)
+    assert out_path.read_text() == REF_PATH.read_text()
+    [entry] = (tmp_path / "cache").iterdir()
+
+    # a hit returns the stored output without running
+    entry.write_text("cached")
+    run(input_file=RAW_PATH, output_file=out_path, input_filter=section_filter, cache=cache)
+    assert out_path.read_text() == "cached"
+    run(input_file=RAW_PATH, output_file=out_path, input_filter=section_filter, cache=cache, refresh_cache=True)
+    assert out_path.read_text() == REF_PATH.read_text()
+
+
+def test_cache_key():
+    contents = RAW_PATH.read_bytes()
+    key = ResultCache.key(contents, SectionFilter(text_to_skip=["a", "b"]), engine="linked")
+    assert key == ResultCache.key(contents, SectionFilter(text_to_skip=["b", "a"]), engine="linked")
+    assert key != ResultCache.key(contents, SectionFilter(text_to_skip=["a"]), engine="linked")
+    assert key != ResultCache.key(contents, SectionFilter(text_to_skip=["a", "b"]), engine="sweep")
+    assert key != ResultCache.key(contents + b"\n", SectionFilter(text_to_skip=["a", "b"]), engine="linked")
+
+
+def test_cache_eviction(tmp_path):
+    cache = ResultCache(tmp_path)
+    for index in range(4):
+        cache.put(f"key{index}", "0123456789")
+        os.utime(cache.entry(f"key{index}"), (index, index))
+    cache.get("key1")   # most recently used
+    cache.max_size = 25
+    cache.put("key4", "0123456789")
+    assert sorted(path.stem for path in tmp_path.iterdir()) == ["key1", "key4"]
+    cache.clear()
+    assert not list(tmp_path.iterdir())
+
+
+def test_cache_hit_replaces_output(tmp_path):
+    cache = ResultCache(tmp_path / "cache")
+    out_path = tmp_path / "out.srt"
+    run(input_file=RAW_PATH, output_file=out_path, cache=cache)
+    os.chmod(out_path, 0o640)
+    previous = tmp_path / "previous.srt"
+    os.link(out_path, previous)
+    [entry] = (tmp_path / "cache").iterdir()
+    entry.write_text("cached")
+    run(input_file=RAW_PATH, output_file=out_path, cache=cache)
+    # written to a new file, the hard link still holds the replaced output
+    assert out_path.read_text() == "cached"
+    assert previous.read_text() != "cached"
+    assert os.stat(out_path).st_mode & 0o777 == 0o640
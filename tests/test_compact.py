@@ -0,0 +1,48 @@
+from io import StringIO
+from pathlib import Path
+
+from srt_link import run
+from srt_link.models.base import SRTSections
+from srt_link.models.section import Section
+
+
+def spans(sections: SRTSections):
+    return [(section.sts, section.ets, section.body) for section in sections.iter_sections()]
+
+
+def build(*sections: Section) -> SRTSections:
+    linked = SRTSections()
+    for section in sections:
+        linked.insert(section)
+    return linked
+
+
+def test_compact_folds_short_fragments():
+    sections = build(Section(sts=0, ets=2000, body="a"), Section(sts=1900, ets=4000, body="b"))
+    assert spans(sections) == [(0, 1900, "a"), (1900, 2000, "a\nb"), (2000, 4000, "b")]
+    assert sections.compact(0.3) == 1
+    assert spans(sections) == [(0, 2000, "a"), (2000, 4000, "b")]
+    assert sections.starts == [0, 2000] and sections.tail.ets == 4000
+
+
+def test_compact_coalesces_identical_bodies():
+    sections = SRTSections()
+    sections.extend([
+        Section(sts=0, ets=1000, body="x"),
+        Section(sts=1000, ets=1100, body="x\ny"),
+        Section(sts=1100, ets=2000, body="x"),
+        Section(sts=2500, ets=2600, body="alone"),
+        Section(sts=2600, ets=3000, body="y"),
+        Section(sts=3000, ets=4000, body="y"),
+    ])
+    # without a threshold only the touching identical bodies are joined
+    assert sections.compact() == 1
+    assert sections.compact(0.3) == 3
+    assert spans(sections) == [(0, 2000, "x"), (2500, 4000, "y")]
+
+
+def test_run_compact():
+    raw = (Path(__file__).parent / "raw.srt").read_text(encoding="utf-8")
+    stats = run(StringIO(raw), StringIO(), stats=True)
+    compacted = run(StringIO(raw), StringIO(), stats=True, compact=0.3)
+    assert compacted.sections_out == stats.sections_out - compacted.compacted
@@ -0,0 +1,48 @@
+import random
+import re
+
+from srt_link.models.input_filter import MIN_DURATION_RULE, SectionFilter
+from srt_link.models.matcher import TextMatcher
+from srt_link.models.section import Section
+
+
+def test_text_matcher():
+    rand = random.Random(0)
+    patterns = ["".join(rand.choice("abc") for _ in range(rand.randint(1, 5))) for _ in range(50)]
+    matcher = TextMatcher(patterns)
+    assert len(matcher.goto) > 1
+    for _ in range(500):
+        text = "".join(rand.choice("abcd") for _ in range(rand.randint(0, 12)))
+        found = matcher.search(text)
+        assert (found is not None) == any(pattern in text for pattern in patterns)
+        assert found is None or found in text
+
+
+def test_strip_counts_digits_outside_brackets():
+    section_filter = SectionFilter()
+    body = "((a)b) 1 {2} <font face='3'>4</font> [5] (6 7"
+    expected = re.sub(section_filter.brackets_filter, '', body)
+    assert section_filter.strip(body) == (expected, len(re.sub("[^0-9]", "", expected)))
+
+
+def test_filter_many_skip_texts():
+    section_filter = SectionFilter(text_to_skip=[f"skip {index}" for index in range(200)], faces_to_skip=["x"])
+    skipped = Section(sts=0, ets=1000, body="please skip 150 now")
+    kept = Section(sts=0, ets=1000, body="<font face='y'>keep [note]</font>")
+    section_filter.apply(skipped)
+    section_filter.apply(kept)
+    assert skipped.skip and not kept.skip
+    assert kept.body == "keep "
+
+
+def test_lazy_body_only_built_when_needed():
+    section_filter = SectionFilter(text_to_skip=["skip"])
+    short = Section.from_str("1\n00:00:01,000 --> 00:00:01,100\nshort\n")
+    clean = Section.from_str("2\n00:00:02,000 --> 00:00:04,000\n\nclean\nline\n")
+    stripped = Section.from_str("3\n00:00:05,000 --> 00:00:07,000\nkeep (note)\n")
+    assert section_filter.apply(short) == MIN_DURATION_RULE
+    assert section_filter.apply(clean) is None and section_filter.apply(stripped) is None
+    # the short section is never read, the clean one is read but not split into lines
+    assert short.source is not None and clean.source is not None and stripped.source is None
+    assert clean.body == "clean\nline" and clean.lines == ["clean", "line"] and clean.source is None
+    assert stripped.body == "keep "
@@ -0,0 +1,66 @@
+import threading
+import time
+
+from srt_link.follow import Follower, follow
+
+SECTIONS = [
+    "1\n00:00:01,000 --> 00:00:03,000\nfirst\n\n",
+    "2\n00:00:02,000 --> 00:00:04,000\nsecond\n\n",
+    "3\n00:00:20,000 --> 00:00:21,000\nthird\n\n",
+    "4\n00:00:40,000 --> 00:00:41,000\nfourth\n\n",
+]
+CLEANED = (
+    "1\n00:00:01,000 --> 00:00:02,000\nfirst\n\n"
+    "2\n00:00:02,000 --> 00:00:03,000\nfirst\nsecond\n\n"
+    "3\n00:00:03,000 --> 00:00:04,000\nsecond\n\n"
+    "4\n00:00:20,000 --> 00:00:21,000\nthird\n\n"
+    "5\n00:00:40,000 --> 00:00:41,000\nfourth\n\n"
+)
+
+
+def test_follow_growing_file(tmp_path):
+    input_path, output_path = tmp_path / "live.srt", tmp_path / "out.srt"
+    input_path.write_text(SECTIONS[0])
+
+    def captioner():
+        for section in SECTIONS[1:]:
+            time.sleep(0.05)
+            with open(input_path, "a") as fd:
+                fd.write(section)
+
+    thread = threading.Thread(target=captioner)
+    thread.start()
+    follow(input_path, output_path, lookback=5, poll_interval=0.01, idle_timeout=0.5)
+    thread.join()
+    assert output_path.read_text() == CLEANED
+
+
+def test_follow_max_latency(tmp_path):
+    input_path, output_path = tmp_path / "live.srt", tmp_path / "out.srt"
+    follower = Follower(input_path, output_path, lookback=60, max_latency=0.05, rewrite=True)
+    follower.feed("".join(SECTIONS[:3]).encode("utf-8"))
+    assert not output_path.exists()     # within the lookback, and the last section may still be typed
+
+    time.sleep(0.06)
+    follower.tick()
+    assert output_path.read_text() == CLEANED.rsplit("5\n", 1)[0]
+    follower.feed(SECTIONS[3].encode("utf-8"))
+    follower.close()
+    assert output_path.read_text() == CLEANED
+    reference = tmp_path / "reference"
+    reference.write_text("")    # created with the default mode
+    assert output_path.stat().st_mode & 0o777 == reference.stat().st_mode & 0o777
+
+
+def test_idle_flush_keeps_a_split_header(tmp_path):
+    output_path = tmp_path / "out.srt"
+    follower = Follower(tmp_path / "live.srt", output_path, lookback=60, max_latency=0.05)
+    follower.feed(b"1\n00:00:01,000 --> 00:00:02,000\nhello\n\n2\n00:00:0")
+    time.sleep(0.06)
+    follower.tick()
+    follower.feed(b"3,000 --> 00:00:04,000\nworld\n\n")
+    follower.close()
+    assert output_path.read_text() == (
+        "1\n00:00:01,000 --> 00:00:02,000\nhello\n\n"
+        "2\n00:00:03,000 --> 00:00:04,000\nworld\n\n"
+    )
@@ -0,0 +1,41 @@
+import subprocess
+import sys
+
+# cumulative microseconds `import srt_link` may take, it should only define names
+IMPORT_TIME_BUDGET_US = 20_000
+
+
+def import_times(statement: str) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement], capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, module = line.rsplit("|", 2)
+            if cumulative.strip().isdigit():
+                times[module.strip()] = int(cumulative)
+    return times
+
+
+def test_import_has_no_side_effects():
+    statement = (
+        "import logging, sys; import srt_link; "
+        "assert not logging.getLogger().handlers; "
+        "assert not [name for name in sys.modules if name.startswith('srt_link.') or name == 'argparse']"
+    )
+    subprocess.run([sys.executable, "-c", statement], check=True)
+
+
+def test_import_time_budget():
+    times = import_times("import srt_link")
+    assert times["srt_link"] < IMPORT_TIME_BUDGET_US
+
+
+def test_lazy_attributes():
+    import srt_link
+    from srt_link.models.section import Section
+    assert srt_link.Section is Section
+    assert callable(srt_link.run)
+    from srt_link.cli import main, parse
+    assert srt_link.main is main and srt_link.parse is parse
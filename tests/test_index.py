@@ -0,0 +1,63 @@
+from io import StringIO
+from pathlib import Path
+
+from srt_link import run
+from srt_link.index import SectionIndex, extract
+from srt_link.models.input_filter import SectionFilter
+from srt_link.models.section import Section
+
+RAW_PATH = Path(__file__).parent / "raw.srt"
+
+
+def window_of(srt: str, start: int, end: int) -> list:
+    """(sts, ets, body) of the sections of a full output clipped to a window"""
+    sections = []
+    for raw_section in srt.strip("\n").split("\n\n"):
+        section = Section.from_str(raw_section)
+        if section.ets > start and section.sts < end:
+            sections.append((max(section.sts, start), min(section.ets, end), section.body))
+    return sections
+
+
+def test_extract_matches_full_run(tmp_path):
+    path = tmp_path / "raw.srt"
+    path.write_bytes(RAW_PATH.read_bytes())
+    section_filter = SectionFilter(faces_to_skip=["FACE SKIP 1", ], text_to_skip=["TEXT-SKIP", ])
+    output = StringIO()
+    run(input_file=path, output_file=output, input_filter=section_filter)
+
+    for start, end in ((0, 10), (5.5, 36), (41, 75), (90, 200), (500, 600)):
+        sections = extract(path, start, end, input_filter=section_filter)
+        extracted = [(section.sts, section.ets, section.body) for section in sections.iter_sections()]
+        assert extracted == window_of(output.getvalue(), start * 1000, end * 1000)
+    assert (tmp_path / "raw.srt.idx").exists()
+
+
+def test_index_reuse(tmp_path):
+    path = tmp_path / "raw.srt"
+    path.write_bytes(RAW_PATH.read_bytes().replace(b"\n", b"\r\n"))
+    with SectionIndex.open(path) as index:
+        assert len(index) == RAW_PATH.read_text().count(" --> ")
+        assert "\r" not in index.raw_section(0)
+    with SectionIndex.load(path) as loaded:
+        assert (loaded.offsets, loaded.sts, loaded.ets) == (index.offsets, index.sts, index.ets)
+
+    path.write_text("1\n00:00:01,000 --> 00:00:02,000\nchanged\n")
+    with SectionIndex.open(path) as index:
+        assert len(index) == 1
+        assert [section.body for section in index.extract(0, 10).iter_sections()] == ["changed"]
+
+
+def test_truncated_index_is_rebuilt(tmp_path):
+    path = tmp_path / "raw.srt"
+    path.write_bytes(RAW_PATH.read_bytes())
+    with SectionIndex.open(path) as index:
+        expected = list(index.offsets)
+    index_path = tmp_path / "raw.srt.idx"
+    contents = index_path.read_bytes()
+    for size in (len(contents) - 8, 10):   # at an item boundary, inside the header
+        index_path.write_bytes(contents[:size])
+        with SectionIndex.open(path) as index:
+            assert list(index.offsets) == expected
+        assert index_path.read_bytes() == contents
+    assert sorted(file.name for file in tmp_path.iterdir()) == ["raw.srt", "raw.srt.idx"]
@@ -0,0 +1,49 @@
+from io import StringIO
+
+import pytest
+
+from srt_link import run
+from srt_link.models.input_filter import SectionFilter
+from tests.generate_test_srts import synthesize
+
+DIALOGUE = (
+    "1\n00:00:01,000 --> 00:00:04,000\nHello\n\n"
+    "2\n00:00:05,000 --> 00:00:08,000\nHow are you\n\n"
+)
+NARRATIVE = (
+    "1\n00:00:02,000 --> 00:00:03,000\nPARIS, 1999\n\n"
+    "2\n00:00:05,000 --> 00:00:06,000\n(whispers)\n\n"
+)
+
+
+def test_merge_inputs():
+    output = StringIO()
+    run(input_file=[StringIO(DIALOGUE), StringIO(NARRATIVE)], output_file=output,
+        input_filter=[SectionFilter(), SectionFilter(filter_parentheses=False)])
+    assert output.getvalue() == (
+        "1\n00:00:01,000 --> 00:00:02,000\nHello\n\n"
+        "2\n00:00:02,000 --> 00:00:03,000\nHello\nPARIS, 1999\n\n"
+        "3\n00:00:03,000 --> 00:00:04,000\nHello\n\n"
+        "4\n00:00:05,000 --> 00:00:06,000\nHow are you\n(whispers)\n\n"
+        "5\n00:00:06,000 --> 00:00:08,000\nHow are you\n\n"
+    )
+
+
+@pytest.mark.parametrize("engine", ["linked", "sweep"])
+def test_merge_inputs_matches_ordered_input(engine):
+    parts = [synthesize(300, overlap=0.3, seed=seed) for seed in range(3)]
+    merged = StringIO()
+    run(input_file=[StringIO(part) for part in parts], output_file=merged, engine=engine)
+
+    # the same sections in a single input, ordered by start, ties in input order
+    raw_sections = [raw_section for part in parts for raw_section in part.strip("\n").split("\n\n")]
+    raw_sections.sort(key=lambda raw_section: raw_section.split("\n")[1][:12])
+    single = StringIO()
+    run(input_file=StringIO("\n\n".join(raw_sections) + "\n\n"), output_file=single, engine=engine)
+    assert merged.getvalue() == single.getvalue()
+
+
+def test_merge_inputs_filter_count():
+    with pytest.raises(ValueError):
+        run(input_file=[StringIO(DIALOGUE), StringIO(NARRATIVE)], output_file=StringIO(),
+            input_filter=[SectionFilter()])
@@ -0,0 +1,48 @@
+from io import StringIO
+
+import pytest
+
+from srt_link import run
+from srt_link.index import SectionIndex
+from srt_link.models.input_filter import SectionFilter
+from srt_link.parallel import run_parallel, split_points
+from tests.generate_test_srts import synthesize
+
+
+def test_split_points(tmp_path):
+    path = tmp_path / "input.srt"
+    path.write_text(synthesize(500, overlap=0.3, disorder=0.05))
+    with SectionIndex.open(path, save=False) as index:
+        points = split_points(index, 8)
+        assert 1 < len(points) < 10
+        for point in points:
+            assert max(index.ets[position] for position in index.order[:point]) <= \
+                   min(index.sts[position] for position in index.order[point:])
+
+
+@pytest.mark.parametrize("engine", ["linked", "sweep"])
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parallel_matches_sequential(tmp_path, engine, workers):
+    path = tmp_path / "input.srt"
+    path.write_text(synthesize(500, overlap=0.3, disorder=0.05))
+    section_filter = SectionFilter(text_to_skip=["TEXT-SKIP", ])
+    sequential, parallel = StringIO(), StringIO()
+    run(input_file=path, output_file=sequential, input_filter=section_filter, engine=engine)
+    run_parallel(input_file=path, output_file=parallel, input_filter=section_filter, workers=workers, engine=engine)
+    assert parallel.getvalue() == sequential.getvalue()
+    assert [file.name for file in tmp_path.iterdir()] == ["input.srt"]    # no index left next to the input
+
+
+def test_parallel_rejects_numpy_engine(tmp_path):
+    path = tmp_path / "input.srt"
+    path.write_text(synthesize(10))
+    with pytest.raises(ValueError, match="linked or sweep"):
+        run_parallel(input_file=path, output_file=StringIO(), engine="numpy")
+
+
+def test_parallel_empty_file(tmp_path):
+    path = tmp_path / "input.srt"
+    path.write_text("")
+    output = StringIO()
+    run_parallel(input_file=path, output_file=output, workers=1)
+    assert output.getvalue() == ""
@@ -0,0 +1,60 @@
+import json
+import subprocess
+import sys
+from io import StringIO
+from pathlib import Path
+
+from srt_link import run
+from srt_link.models.input_filter import SectionFilter
+from srt_link.profiles import profile_output, run_profiles
+
+RAW = Path(__file__).parent / "raw.srt"
+
+
+def expected_output(input_filter: SectionFilter | None, **kwargs) -> str:
+    output = StringIO()
+    run(str(RAW), output, input_filter, **kwargs)
+    return output.getvalue()
+
+
+def test_run_profiles_matches_a_run_per_profile():
+    profiles = {
+        "default": SectionFilter(),
+        "kids": SectionFilter(text_to_skip=["TEXT-SKIP"], faces_to_skip=["FACE SKIP 1"], max_digits=2),
+        "raw": None,
+    }
+    for workers in (1, 2):
+        for engine in ("linked", "sweep"):
+            outputs = {name: StringIO() for name in profiles}
+            run_profiles(str(RAW), profiles, outputs, engine=engine, workers=workers)
+            for name, input_filter in profiles.items():
+                assert outputs[name].getvalue() == expected_output(input_filter, engine=engine)
+
+
+def test_cli_output_profiles(tmp_path):
+    profiles = tmp_path / "profiles.json"
+    kids = {"text_to_skip": ["TEXT-SKIP"]}
+    profiles.write_text(json.dumps({"kids": kids}))
+    output = tmp_path / "out.srt"
+    subprocess.run([sys.executable, "-m", "srt_link", str(RAW), "--profiles", str(profiles),
+                    "--output-profiles", "default,kids", "--workers", "1", "-o", str(output)], check=True)
+    assert profile_output(output, "kids") == tmp_path / "out.kids.srt"
+    assert (tmp_path / "out.default.srt").read_text(encoding="utf-8") == expected_output(SectionFilter())
+    assert (tmp_path / "out.kids.srt").read_text(encoding="utf-8") == expected_output(SectionFilter(**kids))
+
+
+def test_run_profiles_workers_write_paths(tmp_path):
+    profiles = {"default": SectionFilter(), "raw": None}
+    outputs = {name: profile_output(tmp_path / "out.srt", name) for name in profiles}
+    run_profiles(str(RAW), profiles, outputs, workers=2)
+    for name, input_filter in profiles.items():
+        assert outputs[name].read_text(encoding="utf-8") == expected_output(input_filter)
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["out.default.srt", "out.raw.srt"]
+
+
+def test_cli_rejects_modes_that_ignore_flags(tmp_path):
+    for args in (["--batch", str(RAW), "--output-profiles", "default", "-o", str(tmp_path)],
+                 ["--batch", str(RAW), "--parallel", "-o", str(tmp_path)],
+                 ["--serve", "--port", "1", "--compact"]):
+        result = subprocess.run([sys.executable, "-m", "srt_link", *args], capture_output=True, text=True)
+        assert result.returncode == 2 and "can't be used with" in result.stderr
@@ -0,0 +1,24 @@
+from io import StringIO
+from pathlib import Path
+
+from srt_link.models.reader import SectionReader, iter_raw_sections
+
+
+def test_chunked_parse_matches_full_parse():
+    contents = (Path(__file__).parent / "raw.srt").read_text(encoding="utf-8")
+    expected = list(iter_raw_sections(StringIO(contents), chunk_size=len(contents)))
+    assert len(expected) == 49
+    for chunk_size in (1, 7, 31, 64):
+        assert list(iter_raw_sections(StringIO(contents), chunk_size=chunk_size)) == expected
+
+
+def test_single_section():
+    reader = SectionReader()
+    assert reader.feed("1\n00:00:01,000 --> 00:00:02,000\nhello\n") == []
+    assert reader.close() == ["1\n00:00:01,000 --> 00:00:02,000\nhello\n"]
+
+
+def test_text_input_newlines_are_translated():
+    contents = (Path(__file__).parent / "raw.srt").read_text(encoding="utf-8")
+    expected = list(iter_raw_sections(StringIO(contents)))
+    assert list(iter_raw_sections(StringIO(contents.replace("\n", "\r\n"), newline=""), chunk_size=7)) == expected
@@ -1,7 +1,10 @@
+from io import StringIO
 from pathlib import Path
 
 from srt_link import __version__, run
+from srt_link.models.base import SRTSections
 from srt_link.models.input_filter import SectionFilter
+from srt_link.models.section import ms_to_ts
 
 
 def test_version():
@@ -25,3 +28,77 @@ def test_sanity():
     with open(ref_path, "r") as ref_fd, open(out_path, "r") as out_fd:
         assert ref_fd.read() == out_fd.read()
     out_path.unlink()
+
+
+def test_sweep_engine(tmp_path):
+    ref_path = Path(__file__).parent / "ref.srt"
+    out_path = tmp_path / "out.srt"
+    section_filter = SectionFilter(faces_to_skip=["FACE SKIP 1", ], text_to_skip=["TEXT-SKIP", ])
+    run(input_file=Path(__file__).parent / "raw.srt", output_file=out_path, input_filter=section_filter, engine="sweep")
+    with open(ref_path, "r") as ref_fd, open(out_path, "r") as out_fd:
+        assert ref_fd.read() == out_fd.read()
+
+
+def test_sweep_drops_empty_sections():
+    raw = "1\n00:00:01,000 --> 00:00:02,000\nkept\n\n2\n00:00:05,000 --> 00:00:05,000\nempty\n\n"
+    linked, swept = StringIO(), StringIO()
+    run(StringIO(raw), linked)
+    run(StringIO(raw), swept, engine="sweep")
+    assert "empty" in linked.getvalue() and "empty" not in swept.getvalue()
+    assert swept.getvalue() == linked.getvalue().split("2\n")[0]
+
+
+def test_lookback_streaming(tmp_path):
+    ref_path = Path(__file__).parent / "ref.srt"
+    out_path = tmp_path / "out.srt"
+    section_filter = SectionFilter(faces_to_skip=["FACE SKIP 1", ], text_to_skip=["TEXT-SKIP", ])
+    run(input_file=Path(__file__).parent / "raw.srt", output_file=out_path, input_filter=section_filter, lookback=20)
+    with open(ref_path, "r") as ref_fd, open(out_path, "r") as out_fd:
+        assert ref_fd.read() == out_fd.read()
+
+
+def test_lookback_flush():
+    sections = SRTSections(lookback=1)
+    out = StringIO()
+    sections.add("1\n00:00:01,000 --> 00:00:02,000\nfirst\n")
+    sections.add("2\n00:00:05,000 --> 00:00:06,000\nsecond\n")
+    sections.flush(out)
+    assert out.getvalue() == "1\n00:00:01,000 --> 00:00:02,000\nfirst\n\n"
+    assert [section.body for section in sections.iter_sections()] == ["second"]
+    sections.add("3\n00:00:01,500 --> 00:00:03,000\nlate\n")
+    sections.dump(out)
+    assert out.getvalue().endswith("2\n00:00:02,000 --> 00:00:03,000\nlate\n\n3\n00:00:05,000 --> 00:00:06,000\nsecond\n\n")
+
+
+def test_tracer_and_length():
+    events = []
+    sections = SRTSections(tracer=lambda event, this, other: events.append(event))
+    sections.add("1\n00:00:01,000 --> 00:00:03,000\nfirst\n")
+    sections.add("2\n00:00:02,000 --> 00:00:04,000\nsecond\n")
+    sections.add("3\n00:00:00,500 --> 00:00:01,500\nthird\n")
+    assert events == [
+        "link", "start_before_ends_after", "start_before_same_end", "link", "link",
+        "starts_before", "link", "same_start_ends_before", "link",
+    ]
+    assert len(sections) == len(list(sections.iter_sections())) == 5
+
+
+def test_out_of_order_insert():
+    sections = SRTSections()
+    for index in range(5000, 0, -1):
+        sts = index * 1000
+        sections.add(f"{index}\n{ms_to_ts(sts)} --> {ms_to_ts(sts + 1500)}\nline {index}\n")
+    assert len(sections) == 9999
+    assert [section.sts for section in sections.iter_sections()] == sections.starts
+    assert sections.tail.sts == 5000500
+
+
+def test_merged_body_lines():
+    sections = SRTSections()
+    sections.add("1\n00:00:01,000 --> 00:00:03,000\nchorus\nfirst\n")
+    sections.add("2\n00:00:01,000 --> 00:00:03,000\nfirst\nchorus\nsecond\n")
+    sections.add("3\n00:00:02,000 --> 00:00:03,000\nsecond\nthird\n")
+    assert [section.body for section in sections.iter_sections()] == [
+        "chorus\nfirst\nsecond",
+        "chorus\nfirst\nsecond\nthird",
+    ]
@@ -0,0 +1,61 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import asyncio
+import threading
+
+import pytest
+
+from srt_link.models.input_filter import SectionFilter
+from srt_link.server import SRTClient, SRTServer, ServerError
+
+RAW_PATH = Path(__file__).parent / "raw.srt"
+REF_PATH = Path(__file__).parent / "ref.srt"
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    socket_path = str(tmp_path / "srt_link.sock")
+    server = SRTServer({
+        "default": SectionFilter(faces_to_skip=["FACE SKIP 1", ], text_to_skip=["TEXT-SKIP", ]),
+        "keep-all": SectionFilter(filter_parentheses=False, filter_curly_brackets=False, filter_angle_brackets=False,
+                                  filter_square_brackets=False, max_digits=100, min_duration=0),
+    })
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+
+    def serve():
+        asyncio.set_event_loop(loop)
+        running = loop.run_until_complete(server.start(socket_path=socket_path))
+        started.set()
+        loop.run_forever()
+        running.close()
+        loop.run_until_complete(running.wait_closed())
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    started.wait()
+    yield socket_path
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+def test_server_requests(socket_path):
+    with SRTClient(socket_path=socket_path) as client:
+        assert client.clean(srt=RAW_PATH.read_text()) == REF_PATH.read_text()
+        assert client.clean(srt=RAW_PATH.read_text().replace("\n", "\r\n")) == REF_PATH.read_text()
+        assert client.clean(path=str(RAW_PATH), engine="sweep") == REF_PATH.read_text()
+        assert "{hello world}" in client.clean(srt=RAW_PATH.read_text(), profile="keep-all")
+        with pytest.raises(ServerError, match="Unknown profile"):
+            client.clean(srt="", profile="missing")
+        # the connection stays usable after a failed request
+        assert client.clean(srt="") == ""
+
+
+def test_server_concurrent_clients(socket_path):
+    def clean(_):
+        with SRTClient(socket_path=socket_path) as client:
+            return client.clean(srt=RAW_PATH.read_text())
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        assert set(pool.map(clean, range(32))) == {REF_PATH.read_text()}
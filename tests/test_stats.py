@@ -0,0 +1,35 @@
+from io import StringIO
+from pathlib import Path
+
+import pytest
+
+from srt_link import run
+from srt_link.models.input_filter import SectionFilter
+from srt_link.stats import STAGES
+
+RAW_PATH = Path(__file__).parent / "raw.srt"
+REF_PATH = Path(__file__).parent / "ref.srt"
+
+
+@pytest.mark.parametrize("options", [{}, {"lookback": 20}, {"engine": "sweep"}])
+def test_run_stats(options):
+    section_filter = SectionFilter(faces_to_skip=["FACE SKIP 1", ], text_to_skip=["TEXT-SKIP", ])
+    output = StringIO()
+    stats = run(input_file=RAW_PATH, output_file=output, input_filter=section_filter, stats=True, **options)
+    assert output.getvalue() == REF_PATH.read_text()
+
+    assert set(stats.times) == set(STAGES)
+    assert stats.sections_in == RAW_PATH.read_text().count(" --> ")
+    assert stats.sections_out == REF_PATH.read_text().count(" --> ")
+    assert dict(stats.skipped) == {"text": 1, "face": 1, "max_digits": 1, "min_duration": 6}
+    if options.get("engine") == "sweep":
+        assert stats.cases is None and stats.as_dict()["cases"] is None
+        assert "not counted by the sweep engine" in stats.report()
+    else:
+        assert stats.cases["link"] >= stats.sections_out
+        assert stats.cases["same_start_exact"] == 2
+    assert "min_duration" in stats.report()
+
+
+def test_run_without_stats():
+    assert run(input_file=RAW_PATH, output_file=StringIO()) is None
@@ -0,0 +1,51 @@
+from io import BytesIO, StringIO
+from pathlib import Path
+
+import pytest
+
+from srt_link import run
+from srt_link.models.input_filter import SectionFilter
+from tests.generate_test_srts import synthesize
+
+np = pytest.importorskip("numpy")
+
+RAW_PATH = Path(__file__).parent / "raw.srt"
+REF_PATH = Path(__file__).parent / "ref.srt"
+
+
+def test_header_arrays():
+    from srt_link.models.vectorized import header_arrays
+
+    buffer = b"\xef\xbb\xbf12\r\n00:00:01,500 --> 01:02:03,004\r\nbody 7\n00:00:02,000\n\n3\n00:00:04,000 --> 00:00:05,000\n"
+    offsets, sts, ets = header_arrays(buffer)
+    assert offsets.tolist() == [3, buffer.index(b"3\n")]
+    assert sts.tolist() == [1500, 4000]
+    assert ets.tolist() == [3723004, 5000]
+
+
+def test_numpy_engine():
+    section_filter = SectionFilter(faces_to_skip=["FACE SKIP 1", ], text_to_skip=["TEXT-SKIP", ])
+    output = StringIO()
+    run(input_file=RAW_PATH, output_file=output, input_filter=section_filter, engine="numpy")
+    assert output.getvalue() == REF_PATH.read_text()
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_numpy_engine_matches_linked(seed):
+    contents = synthesize(400, overlap=0.4, disorder=0.1, seed=seed).encode("utf-8")
+    contents += b"90\n00:00:01,000 --> 00:00:01,000\nzero\n\n91\n00:00:01,000 --> 00:00:02,000\nsame start\n\n"
+    section_filter = SectionFilter(text_to_skip=["TEXT-SKIP", ]) if seed % 2 else None
+    linked, numpy_output = StringIO(), StringIO()
+    run(input_file=BytesIO(contents), output_file=linked, input_filter=section_filter)
+    run(input_file=BytesIO(contents), output_file=numpy_output, input_filter=section_filter, engine="numpy")
+    assert numpy_output.getvalue() == linked.getvalue()
+
+
+def test_numpy_engine_stats():
+    section_filter = SectionFilter(faces_to_skip=["FACE SKIP 1"], text_to_skip=["TEXT-SKIP"])
+    linked = run(str(RAW_PATH), StringIO(), section_filter, stats=True)
+    numpy = run(str(RAW_PATH), StringIO(), section_filter, engine="numpy", stats=True)
+    assert numpy.sections_in == linked.sections_in == 49
+    assert numpy.sections_out == linked.sections_out
+    assert numpy.skipped == linked.skipped and sum(numpy.skipped.values()) > 0
+    assert all(numpy.times[stage] > 0 for stage in ("read", "parse", "filter", "merge"))
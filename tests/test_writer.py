@@ -0,0 +1,53 @@
+import os
+import random
+from io import StringIO
+
+import pytest
+
+from srt_link.models.section import HOUR_TO_MS, Section, ms_to_ts
+from srt_link.models.writer import format_ts, write_file, write_sections
+
+SECTIONS = [
+    Section(sts=1000, ets=2000, body="first"),
+    Section(sts=2000, ets=3500, body="\n\nsecond\n\n\nline"),
+    Section(sts=4000, ets=101 * HOUR_TO_MS, body="third"),
+]
+
+
+def test_format_ts():
+    rand = random.Random(0)
+    for ms in [0, 999, 1000, HOUR_TO_MS - 1, 100 * HOUR_TO_MS, 123 * HOUR_TO_MS + 4567] + \
+              [rand.randint(0, 100 * HOUR_TO_MS) for _ in range(1000)]:
+        assert format_ts(ms) == ms_to_ts(ms)
+
+
+def test_write_sections():
+    output = StringIO()
+    assert write_sections(output, SECTIONS, start=3) == 6
+    assert output.getvalue() == "".join(f"{number}\n{section}\n\n" for number, section in enumerate(SECTIONS, 3))
+
+
+def test_write_file_is_atomic(tmp_path):
+    path = tmp_path / "out.srt"
+    path.write_text("previous")
+    os.chmod(path, 0o640)
+
+    def failing_sections():
+        yield SECTIONS[0]
+        raise RuntimeError("failed mid-write")
+
+    with pytest.raises(RuntimeError):
+        write_file(path, failing_sections())
+    assert path.read_text() == "previous"
+    assert os.listdir(tmp_path) == ["out.srt"]
+
+    write_file(path, SECTIONS)
+    assert path.read_text(encoding="utf-8").startswith("1\n00:00:01,000 --> 00:00:02,000\nfirst\n\n")
+    assert os.stat(path).st_mode & 0o777 == 0o640
+
+
+def test_write_file_new_file_mode(tmp_path):
+    reference = tmp_path / "reference"
+    reference.write_text("")    # created with the default mode
+    write_file(tmp_path / "out.srt", SECTIONS)
+    assert os.stat(tmp_path / "out.srt").st_mode & 0o777 == os.stat(reference).st_mode & 0o777